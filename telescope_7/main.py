@@ -7,6 +7,7 @@ import time
 import math
 import datetime
 import json
+import copy
 from threading import Lock
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QGridLayout, QLabel,
@@ -14,7 +15,7 @@ from PyQt5.QtWidgets import (
     QPushButton, QGroupBox, QSpinBox, QDoubleSpinBox, QStatusBar,
     QSizePolicy, QScrollArea
 )
-from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer
+from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer, QRunnable, QThreadPool
 from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont
 
 # ==============================================
@@ -49,7 +50,9 @@ DEFAULT_CONFIG = {
         "exposure": 500,
         "image_save_path": "data/images",
         "video_save_path": "data/videos",
-        "ai_temp_path": "data/camera/temp"
+        "ai_temp_path": "data/camera/temp",
+        "save_full_res": False,
+        "h264_pipeline": False
     },
     "ai": {
         "deepseek_api_key": "",
@@ -65,6 +68,27 @@ DEFAULT_CONFIG = {
     }
 }
 
+# Locked Pi 5 GPIO layout (shared, never mutated - only azimuth_left may differ)
+_LOCKED_GPIO = {
+    "alt_up": "GPIO17",
+    "alt_down": "GPIO18",
+    "azimuth_left": "GPIO27",
+    "azimuth_right": "GPIO23"
+}
+
+# Constant AI defaults (everything except the user's API key)
+_AI_DEFAULTS = {
+    "model": "deepseek-chat",
+    "temperature": 0.7,
+    "max_tokens": 500
+}
+
+def _locked_gpio(azimuth_left):
+    """Return a fresh locked GPIO dict (callers may mutate it; the template stays intact)"""
+    if azimuth_left == _LOCKED_GPIO["azimuth_left"]:
+        return dict(_LOCKED_GPIO)
+    return {**_LOCKED_GPIO, "azimuth_left": azimuth_left}
+
 # Pi 5 Pin Mapping (GPIO27 for Azimuth Left)
 PI5_PIN_MAP = {
     "GPIO17": (17, 11),
@@ -79,6 +103,16 @@ PI5_PIN_MAP = {
 # ==============================================
 # Helper Functions (800×480 Optimized)
 # ==============================================
+def load_app_qss():
+    """Read the shared widget stylesheet (assets/app.qss) once"""
+    qss_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "app.qss")
+    try:
+        with open(qss_path, "r") as f:
+            return f.read()
+    except OSError as e:
+        print(f"App stylesheet not loaded: {str(e)}")
+        return ""
+
 def fix_module_path():
     """Fix module import path (validate real sensor modules)"""
     main_script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -93,7 +127,7 @@ def fix_module_path():
         sys.path.append(module_path)
         required_modules = [
             "altitude.py", "azimuth.py", "webcam.py", "sensor.py", 
-            "moon.py", "sun.py", "database.py", "deepseek.py"
+            "moon.py", "sun.py", "database.py", "deepseek.py", "ephem_service.py"
         ]
         missing = [m for m in required_modules if not os.path.exists(os.path.join(module_path, m))]
         if missing:
@@ -123,12 +157,7 @@ def load_config():
                         merge_config(default[key], loaded[key])
                     else:
                         if key == "gpio":
-                            loaded[key] = {
-                                "alt_up": "GPIO17",
-                                "alt_down": "GPIO18",
-                                "azimuth_left": loaded[key].get("azimuth_left", "GPIO27"),
-                                "azimuth_right": "GPIO23"
-                            }
+                            loaded[key] = _locked_gpio(loaded[key].get("azimuth_left", "GPIO27"))
                         elif key == "ai":
                             default[key]["deepseek_api_key"] = loaded[key].get("deepseek_api_key", "")
                         default[key] = loaded[key]
@@ -145,36 +174,54 @@ def save_config(config):
     config_path = "config/settings.json"
     os.makedirs("config", exist_ok=True)
     try:
-        config["gpio"] = {
-            "alt_up": "GPIO17",
-            "alt_down": "GPIO18",
-            "azimuth_left": config["gpio"].get("azimuth_left", "GPIO27"),
-            "azimuth_right": "GPIO23"
-        }
+        config["gpio"] = _locked_gpio(config["gpio"].get("azimuth_left", "GPIO27"))
+        ai = config["ai"]
         config["ai"] = {
-            "deepseek_api_key": config["ai"].get("deepseek_api_key", ""),
-            "model": config["ai"].get("model", "deepseek-chat"),
-            "temperature": config["ai"].get("temperature", 0.7),
-            "max_tokens": config["ai"].get("max_tokens", 500)
+            "deepseek_api_key": ai.get("deepseek_api_key", ""),
+            **{key: ai.get(key, value) for key, value in _AI_DEFAULTS.items()}
         }
-        with open(config_path, "w") as f:
+        # Write a temp file and swap it in (a crash mid-save never leaves a truncated settings.json)
+        tmp_path = config_path + ".tmp"
+        with open(tmp_path, "w") as f:
             json.dump(config, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, config_path)
         print(f"Config saved to {config_path} (GPIO27 + DeepSeek key preserved)")
     except Exception as e:
         print(f"Config save error: {e}")
 
+class _SaveConfigTask(QRunnable):
+    """Background config save (keeps file I/O off the GUI thread)"""
+    def __init__(self, config):
+        super().__init__()
+        self._cfg = config
+
+    def run(self):
+        save_config(self._cfg)
+
+# Cardinal directions in 45° sectors (index 0 = N centred on 0°)
+_CARD = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+
 def degrees_to_cardinal(degrees):
     """Convert azimuth degrees to cardinal direction"""
-    degrees = degrees % 360.0
-    dirs = [
-        ("N", 0, 22.5), ("NE", 22.5, 67.5), ("E", 67.5, 112.5), ("SE", 112.5, 157.5),
-        ("S", 157.5, 202.5), ("SW", 202.5, 247.5), ("W", 247.5, 292.5), ("NW", 292.5, 337.5),
-        ("N", 337.5, 360.0)
-    ]
-    for name, start, end in dirs:
-        if start <= degrees < end:
-            return name
-    return "N"
+    if not math.isfinite(degrees):  # NaN/inf (no sensor fix) would make int() raise
+        return "N"
+    return _CARD[int((degrees % 360.0 + 22.5) // 45) & 7]
+
+def _parse_gps_coord(s, neg_letter):
+    """Parse '40.7128° N' style coordinate (negative if neg_letter follows the °)"""
+    num, _, tail = s.partition("°")
+    value = abs(float(num.strip()))  # float() raises ValueError on bad input
+    return -value if neg_letter in tail else value
+
+# Shared size policy (value type - one instance reused for every expanding widget)
+_SP_EXPANDING = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+def _config_widget(w, min_w=750, min_h=350):
+    """Apply the shared expanding policy + minimum size"""
+    w.setSizePolicy(_SP_EXPANDING)
+    w.setMinimumSize(min_w, min_h)
 
 def check_i2c_bus(bus_number):
     """Check I2C bus existence/permissions (Pi 5 specific)"""
@@ -204,10 +251,14 @@ class TelescopeControllerGUI(QMainWindow):
             DEFAULT_CONFIG["ui"]["min_window_width"],
             DEFAULT_CONFIG["ui"]["min_window_height"]
         )
-        self.setStyleSheet(self._get_800x480_stylesheet())
+        # One stylesheet for the whole window: base rules + shared widget classes (app.qss)
+        self.setStyleSheet(self._get_800x480_stylesheet() + load_app_qss())
 
         # Load Configuration
         self.config = load_config()
+        # Single-thread pool: background config saves run one at a time, in order
+        self._save_pool = QThreadPool(self)
+        self._save_pool.setMaxThreadCount(1)
         
         # Create required directories
         for dir_path in [
@@ -225,16 +276,9 @@ class TelescopeControllerGUI(QMainWindow):
 
         # Parse GPS Coordinates
         try:
-            lat_str = self.config["gps"]["lat"].split("°")[0].strip()
-            lon_str = self.config["gps"]["lon"].split("°")[0].strip()
-            self.lat_numeric = float(lat_str.replace('-', ''))
-            self.lon_numeric = float(lon_str.replace('-', ''))
-            
-            if "S" in self.config["gps"]["lat"]:
-                self.lat_numeric = -self.lat_numeric
-            if "W" in self.config["gps"]["lon"]:
-                self.lon_numeric = -self.lon_numeric
-        except (ValueError, IndexError) as e:
+            self.lat_numeric = _parse_gps_coord(self.config["gps"]["lat"], "S")
+            self.lon_numeric = _parse_gps_coord(self.config["gps"]["lon"], "W")
+        except ValueError as e:
             print(f"GPS Parse Error: {e} | Using defaults")
             self.lat_numeric = 40.7128
             self.lon_numeric = -74.0060
@@ -259,7 +303,7 @@ class TelescopeControllerGUI(QMainWindow):
             
             # AI/Logging
             from deepseek import DeepSeekWidget
-            from database import DatabaseWidget
+            from database import DatabaseWidget, get_db_thread
 
             # Initialize Widgets (COMPACT sizing)
             self.altitude_widget = AltitudeControlWidget(
@@ -275,7 +319,7 @@ class TelescopeControllerGUI(QMainWindow):
 
             # Critical: Real sensor widget (no dummy fallback)
             self.sensor_widget = SensorWidget()
-            self.sensor_widget.setMinimumSize(750, 300)  # Fit 800×480
+            _config_widget(self.sensor_widget, min_h=300)  # Fit 800×480
             self.sensor_widget.sensor_thread.status_signal.connect(self._update_sensor_status)
             self.sensor_widget.sensor_thread.error_signal.connect(self._show_sensor_error)
 
@@ -287,22 +331,23 @@ class TelescopeControllerGUI(QMainWindow):
 
             # Celestial Tracking (COMPACT)
             self.moon_widget = MoonTrackingWidget(lat=self.lat_numeric, lon=self.lon_numeric)
-            self.moon_widget.setMinimumSize(750, 350)
+            _config_widget(self.moon_widget)
             self.moon_widget.slew_to_moon.connect(self._slew_to_moon_position)
             self.moon_widget.lat_lon_updated.connect(self._update_gps_and_ai_context)
             self.moon_widget.auto_track_check.connect(self._on_moon_tracking_toggled)
 
             self.sun_widget = SunTrackingWidget(lat=self.lat_numeric, lon=self.lon_numeric)
-            self.sun_widget.setMinimumSize(750, 350)
+            _config_widget(self.sun_widget)
             self.sun_widget.slew_to_sun.connect(self._slew_to_sun_position)
             self.sun_widget.lat_lon_updated.connect(self._update_gps_and_ai_context)
             self.sun_widget.auto_track_check.connect(self._on_sun_tracking_toggled)
 
             # AI/Logging (COMPACT)
             self.deepseek_widget = DeepSeekWidget(self.config["ai"])
-            self.deepseek_widget.setMinimumSize(750, 350)
+            _config_widget(self.deepseek_widget)
             self.database_widget = DatabaseWidget()
-            self.database_widget.setMinimumSize(750, 350)
+            _config_widget(self.database_widget)
+            self.db = get_db_thread()  # Shared log bus (same thread as the Logs tab)
 
         except ImportError as e:
             QMessageBox.critical(self, "Module Error", 
@@ -340,8 +385,9 @@ class TelescopeControllerGUI(QMainWindow):
         self.tab_widget.addTab(self.deepseek_widget, "6. AI Chat")
         self.tab_widget.addTab(self.database_widget, "7. Logs")
 
-        # Initialize AI Context
-        self.update_ai_context()
+        # Initialize AI Context (deferred until the event loop is idle)
+        self._ai_ctx_pending = False
+        self._schedule_ai_context()
 
     # ==============================================
     # UI Helpers (800×480 OPTIMIZED)
@@ -415,8 +461,7 @@ class TelescopeControllerGUI(QMainWindow):
         title_label.setObjectName("title_label")
         main_layout.addWidget(title_label)
 
-        # Real Sensor Widget (fits 800×480)
-        self.sensor_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        # Real Sensor Widget (fits 800×480, size policy set in __init__)
         main_layout.addWidget(self.sensor_widget)
 
         # Critical Warning Label (COMPACT)
@@ -445,8 +490,8 @@ class TelescopeControllerGUI(QMainWindow):
         main_layout.setStretch(1, 1)
         
         # Compact sizing for motor widgets
-        self.altitude_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.azimuth_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.altitude_widget.setSizePolicy(_SP_EXPANDING)
+        self.azimuth_widget.setSizePolicy(_SP_EXPANDING)
         
         main_layout.addWidget(self.altitude_widget)
         main_layout.addWidget(self.azimuth_widget)
@@ -486,7 +531,7 @@ class TelescopeControllerGUI(QMainWindow):
 
     def _on_image_analyzed(self, filepath):
         """Handler for analyze_image signal"""
-        self.database_widget.db_thread.set_operation(
+        self.db.set_operation(
             "log",
             (0.0, 0.0, "AI", "image_analysis_start", f"Analyzing: {os.path.basename(filepath)}")
         )
@@ -504,7 +549,7 @@ class TelescopeControllerGUI(QMainWindow):
                 self.webcam_widget.toggle_recording()
                 self._update_status_bar(f"Recording: {target}")
                 
-                self.database_widget.db_thread.set_operation(
+                self.db.set_operation(
                     "log",
                     (0.0, 0.0, target, "auto_record_start", f"Auto-record: {target}")
                 )
@@ -513,7 +558,7 @@ class TelescopeControllerGUI(QMainWindow):
                 self.webcam_widget.toggle_recording()
                 self._update_status_bar(f"Recording stopped: {target}")
                 
-                self.database_widget.db_thread.set_operation(
+                self.db.set_operation(
                     "log",
                     (0.0, 0.0, target, "auto_record_stop", f"Auto-record stop: {target}")
                 )
@@ -534,13 +579,13 @@ class TelescopeControllerGUI(QMainWindow):
         self.azimuth_widget.motor_thread.set_target(safe_az)
         self.azimuth_widget.az_slider.setValue(int(safe_az))
         
-        self.database_widget.db_thread.set_operation(
+        self.db.set_operation(
             "log",
             (safe_alt, safe_az, "Moon", "goto_moon", f"Moon: Alt {safe_alt:.1f}°, Az {safe_az:.1f}°")
         )
         
         self._update_status_bar(f"Slewing to Moon: {safe_alt:.1f}°/{safe_az:.1f}°")
-        self.update_ai_context()
+        self._schedule_ai_context()
 
     def _slew_to_sun_position(self, target_alt, target_az):
         """Slew to sun (safety critical)"""
@@ -558,13 +603,13 @@ class TelescopeControllerGUI(QMainWindow):
         self.azimuth_widget.motor_thread.set_target(safe_az)
         self.azimuth_widget.az_slider.setValue(int(safe_az))
         
-        self.database_widget.db_thread.set_operation(
+        self.db.set_operation(
             "log",
             (safe_alt, safe_az, "Sun", "goto_sun", f"Sun: Alt {safe_alt:.1f}°, Az {safe_az:.1f}°")
         )
         
         self._update_status_bar(f"Slewing to Sun: {safe_alt:.1f}°/{safe_az:.1f}°")
-        self.update_ai_context()
+        self._schedule_ai_context()
 
     def _update_gps_and_ai_context(self, new_lat, new_lon):
         """Update GPS and AI context"""
@@ -575,9 +620,19 @@ class TelescopeControllerGUI(QMainWindow):
         self.lat_numeric = new_lat
         self.lon_numeric = new_lon
         
-        self.update_ai_context()
+        self._schedule_ai_context()
         self._update_status_bar(f"GPS: {self.config['gps']['lat'][:10]}, {self.config['gps']['lon'][:10]}")
 
+    def _schedule_ai_context(self):
+        """Coalesce AI context refreshes into one idle-time update"""
+        if not self._ai_ctx_pending:
+            self._ai_ctx_pending = True
+            QTimer.singleShot(0, self._flush_ai_context)
+
+    def _flush_ai_context(self):
+        self._ai_ctx_pending = False
+        self.update_ai_context()
+
     def update_ai_context(self):
         """Update AI context (COMPACT)"""
         try:
@@ -611,7 +666,9 @@ class TelescopeControllerGUI(QMainWindow):
                                 "- Alt Up: 17 | Alt Down: 18\n"
                                 "- Az Left: 27 | Az Right: 23", 
                                 QMessageBox.Ok)
-        save_config(self.config)
+        # Save on the config pool (snapshot so the GUI can keep mutating config)
+        cfg_copy = copy.deepcopy(self.config)
+        self._save_pool.start(_SaveConfigTask(cfg_copy))
 
     def closeEvent(self, event):
         """Cleanup (safe shutdown)"""
@@ -619,9 +676,8 @@ class TelescopeControllerGUI(QMainWindow):
         if self.sensor_widget.sensor_thread.running:
             self.sensor_widget.close()
         
-        # Stop camera
-        if self.webcam_widget.camera_thread.running:
-            self.webcam_widget.close()
+        # Stop camera + AI analysis thread (close() checks the camera itself)
+        self.webcam_widget.close()
         
         # Stop motors
         try:
@@ -637,7 +693,8 @@ class TelescopeControllerGUI(QMainWindow):
         except:
             pass
         
-        # Save config
+        # Save config (synchronous so the write is flushed before exit)
+        self._save_pool.waitForDone(1000)
         save_config(self.config)
         
         self._update_status_bar("Shutting down safely...")
@@ -1,11 +1,16 @@
 import time
-from threading import Lock
+from threading import Event
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
     QLabel, QSlider, QGroupBox, QSpinBox, QFrame, QMessageBox
 )
-from PyQt5.QtCore import QThread, pyqtSignal, Qt
+from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer, QSignalBlocker
 from gpiozero import Motor  # No pigpio import (Pi 5 native)
+from motor_step import step
+try:
+    import lgpio  # Pi 5 gpiochip access (PWM timed in C, not by gpiozero)
+except ImportError:
+    lgpio = None
 
 # Locked GPIO/Physical Pin Mapping for Altitude (NON-CHANGEABLE)
 # Pi 5 Optimized - Fixed to GPIO17/18 (no configuration allowed)
@@ -14,6 +19,80 @@ LOCKED_ALT_PINS = {
     "down": {"gpio": "GPIO18", "physical": 12, "numeric": 18}
 }
 
+# PWM carrier for the altitude motor driver (Hz)
+PWM_FREQUENCY = 1000
+
+class LgpioMotor:
+    """gpiozero.Motor-compatible driver on lgpio (forward/backward/stop/close)"""
+    def __init__(self, forward, backward, chip=0):
+        self.handle = lgpio.gpiochip_open(chip)
+        self.forward_pin = forward
+        self.backward_pin = backward
+        try:
+            lgpio.gpio_claim_output(self.handle, forward, 0)
+            lgpio.gpio_claim_output(self.handle, backward, 0)
+        except Exception:
+            lgpio.gpiochip_close(self.handle)  # Release the chip so gpiozero can take the pins
+            raise
+        self._state = None  # (active pin, speed) - skip redundant PWM restarts
+
+    def _drive(self, on_pin, off_pin, speed):
+        state = (on_pin, speed)
+        if state == self._state:
+            return
+        lgpio.tx_pwm(self.handle, off_pin, 0, 0)  # Frequency 0 = PWM off
+        lgpio.gpio_write(self.handle, off_pin, 0)
+        lgpio.tx_pwm(self.handle, on_pin, PWM_FREQUENCY, speed * 100.0)
+        self._state = state
+
+    def forward(self, speed=1.0):
+        self._drive(self.forward_pin, self.backward_pin, speed)
+
+    def backward(self, speed=1.0):
+        self._drive(self.backward_pin, self.forward_pin, speed)
+
+    def stop(self):
+        for pin in (self.forward_pin, self.backward_pin):
+            lgpio.tx_pwm(self.handle, pin, 0, 0)
+            lgpio.gpio_write(self.handle, pin, 0)
+        self._state = None
+
+    def close(self):
+        self.stop()
+        lgpio.gpiochip_close(self.handle)
+
+# Motor control loop period (seconds)
+MOTOR_TICK = 0.1
+
+# Shared stylesheets (built once at import, reused by every widget)
+_SLIDER_QSS = """
+    QSlider::groove:vertical {
+        width: 8px;
+        background: #ddd;
+        border-radius: 4px;
+    }
+    QSlider::handle:vertical {
+        height: 12px;
+        width: 16px;
+        background: #3498db;
+        border-radius: 8px;
+        margin: 0 -4px;
+    }
+"""
+
+_BTN_QSS = """
+    QPushButton { 
+        background-color: #3498db; 
+        color: white; 
+        border: none; 
+        border-radius: 3px; 
+        padding: 4px 6px; 
+        font-size: 10px;
+        min-height: 25px;
+    }
+    QPushButton:hover { background-color: #2980b9; }
+"""
+
 class AltitudeMotorThread(QThread):
     """Thread-safe altitude motor control (Pi 5 optimized)"""
     position_signal = pyqtSignal(float)
@@ -21,17 +100,24 @@ class AltitudeMotorThread(QThread):
 
     def __init__(self, alt_up_pin, alt_down_pin):
         super().__init__()
-        self.running = True
-        self.lock = Lock()
+        self._shutdown = Event()  # Only shutdown needs coordination (target/speed are lone float stores)
+        self.wake = Event()  # Set on target/speed change or stop (idle thread sleeps on it)
         self.current_alt = 0.0
         self.target_alt = 0.0
         self.speed = 1.0  # Degrees per second (0.1-5.0 range)
 
-        # Initialize motor with Pi 5 native pin factory (no pigpio!)
+        # Initialize motor: lgpio PWM when available, gpiozero as fallback (no pigpio!)
         self.alt_up_pin = alt_up_pin
         self.alt_down_pin = alt_down_pin
+        self.motor = None
+        if lgpio is not None:
+            try:
+                self.motor = LgpioMotor(forward=alt_up_pin, backward=alt_down_pin)
+            except Exception:
+                pass  # gpiochip open / pin claim failed at runtime - fall back to gpiozero below
         try:
-            self.motor = Motor(forward=alt_up_pin, backward=alt_down_pin)
+            if self.motor is None:
+                self.motor = Motor(forward=alt_up_pin, backward=alt_down_pin)
             self.motor.stop()  # Ensure motor starts in stopped state
         except Exception as e:
             self.error_signal.emit(f"Altitude Motor Error: {str(e)}")
@@ -39,54 +125,70 @@ class AltitudeMotorThread(QThread):
 
     def set_target(self, target):
         """Set target altitude (clamped 0-90°)"""
-        with self.lock:
-            self.target_alt = max(0.0, min(90.0, target))
+        self.target_alt = max(0.0, min(90.0, target))
+        self.wake.set()
 
     def set_speed(self, speed):
         """Set motor speed (clamped 0.1-5.0 °/s)"""
-        with self.lock:
-            self.speed = max(0.1, min(5.0, speed))
+        self.speed = max(0.1, min(5.0, speed))
+        self.wake.set()
 
     def run(self):
         """Main motor control loop (low CPU, thread-safe)"""
         if not self.motor:
             return
 
-        while self.running:
-            with self.lock:
-                current = self.current_alt
-                target = self.target_alt
+        # Monotonic schedule: integrate measured dt, sleep to the next 100ms deadline
+        t_prev = next_t = time.monotonic()
+        while not self._shutdown.is_set():
+            # Lone float loads are atomic under the GIL - no lock on the hot path
+            current = self.current_alt
+            target = self.target_alt
+            speed = self.speed
 
             # Calculate position difference
             diff = target - current
             if abs(diff) < 0.1:  # Stop if within 0.1° of target
                 self.motor.stop()
-                time.sleep(0.1)
+                # Holding position: sleep until set_target/set_speed/stop wakes us
+                self.wake.wait()
+                self.wake.clear()
+                # Restart the schedule (idle time is not motion)
+                t_prev = next_t = time.monotonic()
                 continue
 
             # Move motor (normalized speed 0-1 for gpiozero)
             try:
-                speed_normalized = self.speed / 5.0  # Convert 1-5 → 0.2-1.0
-                if diff > 0:
+                now = time.monotonic()
+                dt = now - t_prev  # Seconds since the last tick
+                t_prev = now
+
+                # Integrate + clamp to 0-90° in one compiled call
+                new_alt, direction = step(current, target, speed, dt, 0.0, 90.0)
+                speed_normalized = speed / 5.0  # Convert 1-5 → 0.2-1.0
+                if direction > 0:
                     self.motor.forward(speed_normalized)
-                    self.current_alt += self.speed * 0.1
                 else:
                     self.motor.backward(speed_normalized)
-                    self.current_alt -= self.speed * 0.1
 
-                # Clamp altitude to 0-90°
-                self.current_alt = max(0.0, min(90.0, self.current_alt))
-                self.position_signal.emit(self.current_alt)
-                time.sleep(0.1)  # Pi 5 optimized sleep (reduces CPU usage)
+                self.current_alt = new_alt
+                self.position_signal.emit(new_alt)
+                next_t += MOTOR_TICK
+                delay = next_t - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_t = time.monotonic()  # Fell behind: re-anchor instead of bursting
             except Exception as e:
                 self.error_signal.emit(f"Altitude Movement Error: {str(e)}")
                 self.motor.stop()
                 time.sleep(1)  # Pause before retrying
+                t_prev = next_t = time.monotonic()
 
     def stop(self):
         """Safe motor stop (thread-safe)"""
-        with self.lock:
-            self.running = False
+        self._shutdown.set()
+        self.wake.set()
         if self.motor:
             self.motor.stop()
         self.wait()
@@ -117,7 +219,13 @@ class AltitudeControlWidget(QWidget):
 
         # Initialize motor thread
         self.motor_thread = AltitudeMotorThread(self.alt_up_pin, self.alt_down_pin)
-        self.motor_thread.position_signal.connect(self.update_altitude_display)
+        # Coalesce position updates: keep the latest value, repaint at most every 100ms
+        self._latest_alt = None
+        self._display_timer = QTimer(self)
+        self._display_timer.setSingleShot(True)
+        self._display_timer.setInterval(100)
+        self._display_timer.timeout.connect(self._apply_latest_position)
+        self.motor_thread.position_signal.connect(self._on_position, Qt.QueuedConnection)
         self.motor_thread.error_signal.connect(self.show_error)
 
         # Initialize compact UI (800×480 optimized)
@@ -155,48 +263,27 @@ class AltitudeControlWidget(QWidget):
         self.alt_slider.setValue(0)
         self.alt_slider.setTickInterval(15)  # Fewer ticks = less clutter
         self.alt_slider.setTickPosition(QSlider.TicksBothSides)
-        self.alt_slider.setStyleSheet("""
-            QSlider::groove:vertical {
-                width: 8px;
-                background: #ddd;
-                border-radius: 4px;
-            }
-            QSlider::handle:vertical {
-                height: 12px;
-                width: 16px;
-                background: #3498db;
-                border-radius: 8px;
-                margin: 0 -4px;
-            }
-        """)
-        self.alt_slider.valueChanged.connect(lambda v: self.motor_thread.set_target(float(v)))
+        self.alt_slider.setStyleSheet(_SLIDER_QSS)
+        # Debounce drags: only the final slider value reaches the motor thread
+        self._pending_target = 0
+        self._target_timer = QTimer(self)
+        self._target_timer.setSingleShot(True)
+        self._target_timer.setInterval(50)
+        self._target_timer.timeout.connect(lambda: self.motor_thread.set_target(float(self._pending_target)))
+        self.alt_slider.valueChanged.connect(self._on_slider_changed)
         control_layout.addWidget(self.alt_slider)
 
         # Manual Buttons (compact size)
         btn_layout = QVBoxLayout()
         btn_layout.setSpacing(4)
         
-        # Button style (compact, touch-friendly)
-        btn_style = """
-            QPushButton { 
-                background-color: #3498db; 
-                color: white; 
-                border: none; 
-                border-radius: 3px; 
-                padding: 4px 6px; 
-                font-size: 10px;
-                min-height: 25px;
-            }
-            QPushButton:hover { background-color: #2980b9; }
-        """
-        
         self.up_btn = QPushButton("↑ Up")
         self.down_btn = QPushButton("↓ Down")
         self.stop_btn = QPushButton("■ Stop")
         
-        self.up_btn.setStyleSheet(btn_style)
-        self.down_btn.setStyleSheet(btn_style)
-        self.stop_btn.setStyleSheet(btn_style)
+        self.up_btn.setStyleSheet(_BTN_QSS)
+        self.down_btn.setStyleSheet(_BTN_QSS)
+        self.stop_btn.setStyleSheet(_BTN_QSS)
 
         self.up_btn.clicked.connect(self.move_up)
         self.down_btn.clicked.connect(self.move_down)
@@ -255,10 +342,30 @@ class AltitudeControlWidget(QWidget):
         """Stop at current position"""
         self.motor_thread.set_target(self.motor_thread.current_alt)
 
+    def _on_position(self, value):
+        """Store the newest motor position (display refresh is throttled)"""
+        self._latest_alt = value
+        if not self._display_timer.isActive():
+            self._display_timer.start()
+
+    def _apply_latest_position(self):
+        if self._latest_alt is not None:
+            self.update_altitude_display(self._latest_alt)
+
     def update_altitude_display(self, value):
         """Update position display (compact format)"""
         self.alt_display.setText(f"Current: {value:.1f} °")
-        self.alt_slider.setValue(int(round(value)))
+        # Move the slider without echoing valueChanged back into set_target
+        iv = int(round(value))
+        if iv != self.alt_slider.value():
+            blocker = QSignalBlocker(self.alt_slider)
+            self.alt_slider.setValue(iv)
+            del blocker
+
+    def _on_slider_changed(self, value):
+        """Remember the slider value and (re)start the debounce timer"""
+        self._pending_target = value
+        self._target_timer.start()
 
     def show_error(self, error_msg):
         """Show compact error dialog"""
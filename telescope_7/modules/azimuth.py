@@ -1,11 +1,12 @@
 import time
-from threading import Lock
+from threading import Event
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
     QLabel, QSlider, QGroupBox, QSpinBox, QFrame, QMessageBox
 )
-from PyQt5.QtCore import QThread, pyqtSignal, Qt
+from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer, QSignalBlocker
 from gpiozero import Motor  # No pigpio import (Pi 5 native)
+from motor_step import step_wrapped
 
 # Locked GPIO/Physical Pin Mapping for Azimuth (NON-CHANGEABLE)
 # FIXED: Updated to GPIO27 (left) / GPIO23 (right) per main.py requirements
@@ -15,6 +16,39 @@ LOCKED_AZ_PINS = {
     "right": {"gpio": "GPIO23", "physical": 16, "numeric": 23}
 }
 
+# Motor control loop period (seconds)
+MOTOR_TICK = 0.1
+
+# Shared stylesheets (built once at import, reused by every widget)
+_SLIDER_QSS = """
+    QSlider::groove:horizontal {
+        height: 8px;
+        background: #ddd;
+        border-radius: 4px;
+    }
+    QSlider::handle:horizontal {
+        width: 16px;
+        height: 12px;
+        background: #3498db;
+        border-radius: 8px;
+        margin: -4px 0;
+    }
+"""
+
+_BTN_QSS = """
+    QPushButton { 
+        background-color: #3498db; 
+        color: white; 
+        border: none; 
+        border-radius: 3px; 
+        padding: 4px 6px; 
+        font-size: 10px;
+        min-height: 25px;
+        flex: 1;
+    }
+    QPushButton:hover { background-color: #2980b9; }
+"""
+
 class AzimuthMotorThread(QThread):
     """Thread-safe azimuth motor control (Pi 5 optimized)"""
     position_signal = pyqtSignal(float)
@@ -22,8 +56,8 @@ class AzimuthMotorThread(QThread):
 
     def __init__(self, az_left_pin, az_right_pin):
         super().__init__()
-        self.running = True
-        self.lock = Lock()
+        self._shutdown = Event()  # Only shutdown needs coordination (target/speed are lone float stores)
+        self.wake = Event()  # Set on target/speed change or stop (idle thread sleeps on it)
         self.current_az = 0.0
         self.target_az = 0.0
         self.speed = 1.0  # Degrees per second (0.1-5.0 range)
@@ -40,55 +74,71 @@ class AzimuthMotorThread(QThread):
 
     def set_target(self, target):
         """Set target azimuth (wrapped 0-360°)"""
-        with self.lock:
-            self.target_az = target % 360.0  # Wrap to 0-360°
+        self.target_az = target % 360.0  # Wrap to 0-360°
+        self.wake.set()
 
     def set_speed(self, speed):
         """Set motor speed (clamped 0.1-5.0 °/s)"""
-        with self.lock:
-            self.speed = max(0.1, min(5.0, speed))
+        self.speed = max(0.1, min(5.0, speed))
+        self.wake.set()
 
     def run(self):
         """Main motor control loop (low CPU, thread-safe)"""
         if not self.motor:
             return
 
-        while self.running:
-            with self.lock:
-                current = self.current_az
-                target = self.target_az
+        # Monotonic schedule: integrate measured dt, sleep to the next 100ms deadline
+        t_prev = next_t = time.monotonic()
+        while not self._shutdown.is_set():
+            # Lone float loads are atomic under the GIL - no lock on the hot path
+            current = self.current_az
+            target = self.target_az
+            speed = self.speed
 
-            # Calculate shortest path (0-360° wrap)
-            diff = target - current
-            if abs(diff) > 180:
-                diff = diff - 360 if diff > 0 else diff + 360
+            # Shortest path (0-360° wrap), branch-free modulo
+            diff = (target - current + 540.0) % 360.0 - 180.0
 
             if abs(diff) < 0.1:  # Stop if within 0.1° of target
                 self.motor.stop()
-                time.sleep(0.1)
+                # Holding position: sleep until set_target/set_speed/stop wakes us
+                self.wake.wait()
+                self.wake.clear()
+                # Restart the schedule (idle time is not motion)
+                t_prev = next_t = time.monotonic()
                 continue
 
             # Move motor (normalized speed 0-1 for gpiozero)
             try:
-                speed_normalized = self.speed / 5.0  # Convert 1-5 → 0.2-1.0
-                if diff > 0:
+                now = time.monotonic()
+                dt = now - t_prev  # Seconds since the last tick
+                t_prev = now
+
+                # Integrate + wrap to 0-360° in one compiled call
+                new_az, direction = step_wrapped(current, diff, speed, dt)
+                speed_normalized = speed / 5.0  # Convert 1-5 → 0.2-1.0
+                if direction > 0:
                     self.motor.forward(speed_normalized)
-                    self.current_az = (self.current_az + self.speed * 0.1) % 360.0
                 else:
                     self.motor.backward(speed_normalized)
-                    self.current_az = (self.current_az - self.speed * 0.1) % 360.0
 
-                self.position_signal.emit(self.current_az)
-                time.sleep(0.1)  # Pi 5 optimized sleep (reduces CPU usage)
+                self.current_az = new_az
+                self.position_signal.emit(new_az)
+                next_t += MOTOR_TICK
+                delay = next_t - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_t = time.monotonic()  # Fell behind: re-anchor instead of bursting
             except Exception as e:
                 self.error_signal.emit(f"Azimuth Movement Error: {str(e)}")
                 self.motor.stop()
                 time.sleep(1)  # Pause before retrying
+                t_prev = next_t = time.monotonic()
 
     def stop(self):
         """Safe motor stop (thread-safe)"""
-        with self.lock:
-            self.running = False
+        self._shutdown.set()
+        self.wake.set()
         if self.motor:
             self.motor.stop()
         self.wait()
@@ -120,7 +170,13 @@ class AzimuthControlWidget(QWidget):
 
         # Initialize motor thread
         self.motor_thread = AzimuthMotorThread(self.az_left_pin, self.az_right_pin)
-        self.motor_thread.position_signal.connect(self.update_azimuth_display)
+        # Coalesce position updates: keep the latest value, repaint at most every 100ms
+        self._latest_az = None
+        self._display_timer = QTimer(self)
+        self._display_timer.setSingleShot(True)
+        self._display_timer.setInterval(100)
+        self._display_timer.timeout.connect(self._apply_latest_position)
+        self.motor_thread.position_signal.connect(self._on_position, Qt.QueuedConnection)
         self.motor_thread.error_signal.connect(self.show_error)
 
         # Initialize compact UI (800×480 optimized)
@@ -158,49 +214,27 @@ class AzimuthControlWidget(QWidget):
         self.az_slider.setValue(0)
         self.az_slider.setTickInterval(30)  # Fewer ticks = less clutter
         self.az_slider.setTickPosition(QSlider.TicksBothSides)
-        self.az_slider.setStyleSheet("""
-            QSlider::groove:horizontal {
-                height: 8px;
-                background: #ddd;
-                border-radius: 4px;
-            }
-            QSlider::handle:horizontal {
-                width: 16px;
-                height: 12px;
-                background: #3498db;
-                border-radius: 8px;
-                margin: -4px 0;
-            }
-        """)
-        self.az_slider.valueChanged.connect(lambda v: self.motor_thread.set_target(float(v)))
+        self.az_slider.setStyleSheet(_SLIDER_QSS)
+        # Debounce drags: only the final slider value reaches the motor thread
+        self._pending_target = 0
+        self._target_timer = QTimer(self)
+        self._target_timer.setSingleShot(True)
+        self._target_timer.setInterval(50)
+        self._target_timer.timeout.connect(lambda: self.motor_thread.set_target(float(self._pending_target)))
+        self.az_slider.valueChanged.connect(self._on_slider_changed)
         control_layout.addWidget(self.az_slider)
 
         # Manual Buttons (compact size)
         btn_layout = QHBoxLayout()
         btn_layout.setSpacing(4)
         
-        # Button style (matches altitude widget - consistent look)
-        btn_style = """
-            QPushButton { 
-                background-color: #3498db; 
-                color: white; 
-                border: none; 
-                border-radius: 3px; 
-                padding: 4px 6px; 
-                font-size: 10px;
-                min-height: 25px;
-                flex: 1;
-            }
-            QPushButton:hover { background-color: #2980b9; }
-        """
-        
         self.left_btn = QPushButton("← Left")
         self.right_btn = QPushButton("Right →")
         self.stop_btn = QPushButton("■ Stop")
         
-        self.left_btn.setStyleSheet(btn_style)
-        self.right_btn.setStyleSheet(btn_style)
-        self.stop_btn.setStyleSheet(btn_style)
+        self.left_btn.setStyleSheet(_BTN_QSS)
+        self.right_btn.setStyleSheet(_BTN_QSS)
+        self.stop_btn.setStyleSheet(_BTN_QSS)
 
         self.left_btn.clicked.connect(self.move_left)
         self.right_btn.clicked.connect(self.move_right)
@@ -259,10 +293,30 @@ class AzimuthControlWidget(QWidget):
         """Stop at current position"""
         self.motor_thread.set_target(self.motor_thread.current_az)
 
+    def _on_position(self, value):
+        """Store the newest motor position (display refresh is throttled)"""
+        self._latest_az = value
+        if not self._display_timer.isActive():
+            self._display_timer.start()
+
+    def _apply_latest_position(self):
+        if self._latest_az is not None:
+            self.update_azimuth_display(self._latest_az)
+
     def update_azimuth_display(self, value):
         """Update position display (compact format)"""
         self.az_display.setText(f"Current: {value:.1f} °")
-        self.az_slider.setValue(int(round(value)))
+        # Move the slider without echoing valueChanged back into set_target
+        iv = int(round(value))
+        if iv != self.az_slider.value():
+            blocker = QSignalBlocker(self.az_slider)
+            self.az_slider.setValue(iv)
+            del blocker
+
+    def _on_slider_changed(self, value):
+        """Remember the slider value and (re)start the debounce timer"""
+        self._pending_target = value
+        self._target_timer.start()
 
     def show_error(self, error_msg):
         """Show compact error dialog"""
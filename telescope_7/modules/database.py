@@ -1,4 +1,5 @@
 import time
+import queue
 import sqlite3
 from threading import Lock
 from PyQt5.QtWidgets import (
@@ -8,9 +9,48 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer
 
+# Rows kept in the on-screen log table (oldest dropped first; DB keeps everything)
+MAX_TABLE_ROWS = 500
+
+# Single INSERT statement (same string every time -> reused from sqlite's statement cache)
+_INSERT_SQL = '''
+    INSERT INTO telescope_logs 
+    (timestamp, altitude, azimuth, target, action, details)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# Column headers (shared by the table and CSV export)
+HEADERS = ["Time", "Alt (°)", "Az (°)", "Target", "Action", "Details"]
+
+# Shared stylesheets (built once at import)
+_TABLE_QSS = """
+    QTableWidget { font-size: 11px; }
+    QHeaderView::section { 
+        font-size: 10px; 
+        padding: 2px; 
+        background-color: #3498db; 
+        color: black;
+    }
+"""
+
+# Match motor widget button styling
+_BTN_QSS = """
+    QPushButton { 
+        background-color: #3498db; 
+        color: white; 
+        border: none; 
+        border-radius: 4px; 
+        padding: 6px 8px; 
+        font-size: 12px;
+    }
+    QPushButton:hover { background-color: #2980b9; }
+"""
+
 class DatabaseThread(QThread):
     log_added = pyqtSignal(list)
     error_signal = pyqtSignal(str)
+    cleared = pyqtSignal()  # "clear" operation done
+    count_signal = pyqtSignal(int)  # Result of a "count" operation
 
     def __init__(self):
         super().__init__()
@@ -18,12 +58,22 @@ class DatabaseThread(QThread):
         self.lock = Lock()
         self.db_conn = None
         self.db_cursor = None
-        self.operation_queue = []
+        self.operation_queue = queue.Queue()  # Thread-safe; UI never blocks behind the DB thread
 
         # Initialize database
         try:
-            self.db_conn = sqlite3.connect('telescope_logs.db', check_same_thread=False)
+            # Autocommit mode: run() wraps each batch in an explicit BEGIN/COMMIT
+            self.db_conn = sqlite3.connect(
+                'telescope_logs.db', check_same_thread=False,
+                cached_statements=256, isolation_level=None
+            )
             self.db_cursor = self.db_conn.cursor()
+            # WAL + relaxed sync: batched commits without a full fsync each (SD card friendly)
+            self.db_cursor.execute('PRAGMA journal_mode=WAL')
+            self.db_cursor.execute('PRAGMA synchronous=NORMAL')
+            self.db_cursor.execute('PRAGMA temp_store=MEMORY')
+            self.db_cursor.execute('PRAGMA cache_size=-8000')      # ~8 MB page cache
+            self.db_cursor.execute('PRAGMA mmap_size=67108864')    # 64 MB memory-mapped reads
             # Create table if not exists
             self.db_cursor.execute('''
                 CREATE TABLE IF NOT EXISTS telescope_logs (
@@ -36,61 +86,163 @@ class DatabaseThread(QThread):
                     details TEXT
                 )
             ''')
+            # Index for time-ordered queries/exports
+            self.db_cursor.execute(
+                'CREATE INDEX IF NOT EXISTS idx_ts ON telescope_logs(timestamp)'
+            )
             self.db_conn.commit()
         except Exception as e:
             self.error_signal.emit(f"Database Error: {str(e)}")
 
     def set_operation(self, action, data):
-        with self.lock:
-            self.operation_queue.append((action, data))
+        self.operation_queue.put((action, data))
 
     def run(self):
         if not self.db_conn:
             return
 
         while self.running:
-            with self.lock:
-                if not self.operation_queue:
-                    time.sleep(0.1)
-                    continue
-                op, data = self.operation_queue.pop(0)
-
+            # Block until work arrives (timeout only to re-check self.running)
             try:
+                op, data = self.operation_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            # Drain whatever else is pending so a burst costs one commit
+            ops = [(op, data)]
+            while len(ops) < 64:
+                try:
+                    ops.append(self.operation_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Queue order is kept: logs ahead of a clear/count are committed first
+            rows = []
+            for op, data in ops:
                 if op == "log":
-                    # Data format: (altitude, azimuth, target, action, details)
-                    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    alt, az, target, action, details = data
-                    self.db_cursor.execute('''
-                        INSERT INTO telescope_logs 
-                        (timestamp, altitude, azimuth, target, action, details)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (timestamp, alt, az, target, action, details))
-                    self.db_conn.commit()
-                    # Emit log for UI update
-                    self.log_added.emit([timestamp, alt, az, target, action, details])
-            except Exception as e:
-                self.error_signal.emit(f"Log Error: {str(e)}")
-                time.sleep(1)
+                    self._append_row(rows, op, data)
+                else:
+                    self._write_rows(rows)
+                    rows = []
+                    self._maintenance(op)
+            self._write_rows(rows)
+
+    def _write_rows(self, rows):
+        """Insert a batch of log rows in one transaction"""
+        if not rows:
+            return
+        try:
+            self.db_cursor.execute('BEGIN')
+            self.db_cursor.executemany(_INSERT_SQL, rows)
+            self.db_cursor.execute('COMMIT')
+            # Emit logs for UI update (after the batch is durable)
+            for row in rows:
+                self.log_added.emit(list(row))
+        except Exception as e:
+            if self.db_conn.in_transaction:
+                self.db_conn.rollback()
+            self.error_signal.emit(f"Log Error: {str(e)}")
+            time.sleep(1)
+
+    def _maintenance(self, op):
+        """Run a queued "clear"/"count" on this thread (never inside a log batch)"""
+        try:
+            if op == "clear":
+                self.db_cursor.execute("DELETE FROM telescope_logs")
+                self.cleared.emit()
+            elif op == "count":
+                self.db_cursor.execute("SELECT COUNT(*) FROM telescope_logs")
+                self.count_signal.emit(self.db_cursor.fetchone()[0])
+        except Exception as e:
+            self.error_signal.emit(f"Database Error: {str(e)}")
+
+    def _append_row(self, rows, op, data):
+        """Convert a queued "log" operation into an INSERT parameter tuple"""
+        if op == "log":
+            # Data format: (altitude, azimuth, target, action, details)
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            alt, az, target, action, details = data
+            rows.append((timestamp, alt, az, target, action, details))
 
     def stop(self):
         with self.lock:
             self.running = False
+        self.wait()
         if self.db_conn:
             self.db_conn.close()
-        self.wait()
+
+# Process-wide log bus: one writer thread, one sqlite connection
+_db_thread = None
+
+def get_db_thread():
+    """Return the shared DatabaseThread (created and started on first use)"""
+    global _db_thread
+    if _db_thread is None:
+        _db_thread = DatabaseThread()
+        _db_thread.start()
+    return _db_thread
+
+class ExportThread(QThread):
+    """Stream the full log table from sqlite to CSV (off the GUI thread)"""
+    done_signal = pyqtSignal(str)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, filename):
+        super().__init__()
+        self.filename = filename
+
+    def run(self):
+        try:
+            import csv
+            # Own connection: sqlite objects must stay on the thread that made them
+            conn = sqlite3.connect('telescope_logs.db')
+            try:
+                cur = conn.execute(
+                    'SELECT timestamp, altitude, azimuth, target, action, details '
+                    'FROM telescope_logs ORDER BY id'
+                )
+                cur.arraysize = 1000
+                # 1 MB buffer: few large writes instead of many small ones on the SD card
+                with open(self.filename, 'w', newline='', buffering=1 << 20) as f:
+                    writer = csv.writer(f)
+                    # Write header
+                    writer.writerow(HEADERS)
+                    # Write rows straight from the cursor
+                    writer.writerows(cur)
+            finally:
+                conn.close()
+            self.done_signal.emit(self.filename)
+        except Exception as e:
+            self.error_signal.emit(str(e))
 
 class DatabaseWidget(QWidget):
     def __init__(self):
         super().__init__()
-        self.db_thread = DatabaseThread()
+        self.db_thread = get_db_thread()
         self.db_thread.log_added.connect(self.add_log_entry)
         self.db_thread.error_signal.connect(self.show_error)
+        self.export_thread = None
+
+        # True DB row count (the on-screen table is capped at MAX_TABLE_ROWS)
+        self._log_count = 0
+
+        # Read-only item flags (computed once, not per cell)
+        self._read_only_flags = QTableWidgetItem().flags() & ~Qt.ItemIsEditable
+
+        # Batch incoming logs so the table repaints once per flush, not per row
+        self.pending_rows = []
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(200)
+        self.flush_timer.timeout.connect(self.flush_pending_rows)
         
         # UI Setup (800×480 optimized)
         self.init_ui()
-        
-        # Start database thread
-        self.db_thread.start()
+
+        # Clear/count run on the DB thread (its connection is never used from the GUI thread)
+        self.db_thread.cleared.connect(self.on_logs_cleared)
+        self.db_thread.count_signal.connect(self.on_log_count)
+        self.db_thread.set_operation("count", None)
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -108,19 +260,9 @@ class DatabaseWidget(QWidget):
         # Log Table (compact for small screen)
         self.log_table = QTableWidget()
         self.log_table.setColumnCount(6)
-        self.log_table.setHorizontalHeaderLabels([
-            "Time", "Alt (°)", "Az (°)", "Target", "Action", "Details"
-        ])
+        self.log_table.setHorizontalHeaderLabels(HEADERS)
         # Optimize table for small screen
-        self.log_table.setStyleSheet("""
-            QTableWidget { font-size: 11px; }
-            QHeaderView::section { 
-                font-size: 10px; 
-                padding: 2px; 
-                background-color: #3498db; 
-                color: black;
-            }
-        """)
+        self.log_table.setStyleSheet(_TABLE_QSS)
         # Resize columns to fit 800px width
         header = self.log_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # Time
@@ -138,20 +280,8 @@ class DatabaseWidget(QWidget):
         btn_layout = QHBoxLayout()
         self.clear_btn = QPushButton("Clear Logs")
         self.export_btn = QPushButton("Export Logs")
-        # Match motor widget button styling
-        btn_style = """
-            QPushButton { 
-                background-color: #3498db; 
-                color: white; 
-                border: none; 
-                border-radius: 4px; 
-                padding: 6px 8px; 
-                font-size: 12px;
-            }
-            QPushButton:hover { background-color: #2980b9; }
-        """
-        self.clear_btn.setStyleSheet(btn_style)
-        self.export_btn.setStyleSheet(btn_style)
+        self.clear_btn.setStyleSheet(_BTN_QSS)
+        self.export_btn.setStyleSheet(_BTN_QSS)
 
         self.clear_btn.clicked.connect(self.clear_logs)
         self.export_btn.clicked.connect(self.export_logs)
@@ -164,27 +294,51 @@ class DatabaseWidget(QWidget):
         status_frame = QFrame()
         status_frame.setStyleSheet("background-color: #f8f9fa; border-radius: 4px; padding: 8px;")
         status_layout = QVBoxLayout(status_frame)
-        self.log_count_label = QLabel("Total Logs: 0")
+        self.log_count_label = QLabel(f"Total Logs: {self._log_count}")
         self.log_count_label.setStyleSheet("font-size: 11px; color: #666;")
         status_layout.addWidget(self.log_count_label)
         layout.addWidget(status_frame)
 
     def add_log_entry(self, log_data):
-        # Add new log to table (insert at top for readability)
-        row = 0
-        self.log_table.insertRow(row)
-        for col, data in enumerate(log_data):
-            # Format numeric values for compact display
-            if col in [1,2] and data is not None:
-                item = QTableWidgetItem(f"{data:.1f}")
-            else:
-                item = QTableWidgetItem(str(data) if data else "-")
-            item.setTextAlignment(Qt.AlignCenter)
-            item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # Read-only
-            self.log_table.setItem(row, col, item)
-        
+        # Buffer the row; the table is refreshed once per batch
+        self.pending_rows.append(log_data)
+        self._log_count += 1
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush_pending_rows(self):
+        """Insert all buffered logs in one repaint (newest on top, capped rows)"""
+        if not self.pending_rows:
+            return
+        rows, self.pending_rows = self.pending_rows, []
+
+        table = self.log_table
+        fmt = "{:.1f}".format
+        read_only = self._read_only_flags
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            for log_data in rows:
+                # Drop the oldest row once the cap is reached
+                if table.rowCount() >= MAX_TABLE_ROWS:
+                    table.removeRow(table.rowCount() - 1)
+                # Add new log to table (insert at top for readability)
+                table.insertRow(0)
+                for col, data in enumerate(log_data):
+                    # Format numeric values for compact display
+                    if col in [1,2] and data is not None:
+                        item = QTableWidgetItem(fmt(data))
+                    else:
+                        item = QTableWidgetItem(str(data) if data else "-")
+                    item.setTextAlignment(Qt.AlignCenter)
+                    item.setFlags(read_only)
+                    table.setItem(0, col, item)
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
+
         # Update log count
-        self.log_count_label.setText(f"Total Logs: {self.log_table.rowCount()}")
+        self.log_count_label.setText(f"Total Logs: {self._log_count}")
 
     def clear_logs(self):
         confirm = QMessageBox.question(
@@ -192,40 +346,45 @@ class DatabaseWidget(QWidget):
             QMessageBox.Yes | QMessageBox.No
         )
         if confirm == QMessageBox.Yes:
+            self.pending_rows = []
             self.log_table.setRowCount(0)
-            # Clear database
-            try:
-                self.db_thread.db_cursor.execute("DELETE FROM telescope_logs")
-                self.db_thread.db_conn.commit()
-                self.log_count_label.setText("Total Logs: 0")
-            except Exception as e:
-                self.show_error(f"Clear Error: {str(e)}")
+            # Clear database (queued behind any pending log batch)
+            self.db_thread.set_operation("clear", None)
+
+    def on_logs_cleared(self):
+        """DB thread finished the DELETE - drop rows that arrived meanwhile"""
+        self.pending_rows = []
+        self.log_table.setRowCount(0)
+        self._log_count = 0
+        self.log_count_label.setText("Total Logs: 0")
+
+    def on_log_count(self, count):
+        self._log_count = count
+        self.log_count_label.setText(f"Total Logs: {count}")
 
     def export_logs(self):
-        try:
-            import csv
-            filename = f"telescope_logs_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            with open(filename, 'w', newline='') as f:
-                writer = csv.writer(f)
-                # Write header
-                writer.writerow(["Time", "Alt (°)", "Az (°)", "Target", "Action", "Details"])
-                # Write rows
-                for row in range(self.log_table.rowCount()):
-                    row_data = []
-                    for col in range(self.log_table.columnCount()):
-                        item = self.log_table.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    writer.writerow(row_data)
-            QMessageBox.information(self, "Export Success", f"Logs exported to {filename}")
-        except Exception as e:
-            self.show_error(f"Export Error: {str(e)}")
+        if self.export_thread is not None and self.export_thread.isRunning():
+            return
+        filename = time.strftime("telescope_logs_%Y%m%d_%H%M%S.csv")
+        self.export_btn.setEnabled(False)
+        self.export_thread = ExportThread(filename)
+        self.export_thread.done_signal.connect(self.on_export_done)
+        self.export_thread.error_signal.connect(self.on_export_error)
+        self.export_thread.start()
+
+    def on_export_done(self, filename):
+        self.export_btn.setEnabled(True)
+        QMessageBox.information(self, "Export Success", f"Logs exported to {filename}")
+
+    def on_export_error(self, error_msg):
+        self.export_btn.setEnabled(True)
+        self.show_error(f"Export Error: {error_msg}")
 
     def show_error(self, error_msg):
         QMessageBox.critical(self, "Database Error", error_msg)
 
     def closeEvent(self, event):
+        if self.export_thread is not None:
+            self.export_thread.wait()
         self.db_thread.stop()
         event.accept()
-
-# Fix missing datetime import (critical for logs)
-import datetime
\ No newline at end of file
@@ -1,76 +1,238 @@
+import os
+import queue
 import requests
 import json
-from threading import Lock
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from threading import Event, Lock
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
     QTextEdit, QLabel, QLineEdit, QFrame, QMessageBox,
     QGroupBox
 )
-from PyQt5.QtCore import QThread, pyqtSignal, Qt
+from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer
+from PyQt5.QtGui import QTextCursor
+
+def _ctx_angle(text, label, default):
+    """Angle after `label` up to the next "°" (str.partition: no lists, one scan)"""
+    _, sep, rest = text.partition(label)
+    if not sep:
+        return default
+    num, _, _ = rest.partition("°")
+    try:
+        return float(num.strip())  # Handles negative values
+    except ValueError:
+        return default
+
+# In-flight DeepSeek requests (matches the session's connection pool size)
+MAX_CONCURRENT_REQUESTS = 4
+
+TOAST_MS = 3000  # Info message display time
+STOP_TIMEOUT_MS = 2000  # Never hold up window close on a slow request
+
+# Response cache: LRU bound and how many new entries are held before the file is rewritten
+CACHE_MAX_ENTRIES = 200
+CACHE_SAVE_EVERY = 10
 
 class DeepSeekThread(QThread):
-    response_signal = pyqtSignal(str)
+    response_signal = pyqtSignal(int, str)  # (request id, full reply)
     error_signal = pyqtSignal(str)
+    chunk_signal = pyqtSignal(int, str)  # (request id, streamed reply fragment)
 
     def __init__(self, api_key, model="deepseek-chat"):
         super().__init__()
-        self.running = True
-        self.lock = Lock()
-        self.api_key = api_key
+        self._stop_event = Event()
         self.model = model
-        self.prompt_queue = []
+        self.prompt_queue = queue.Queue()  # Blocking get: wakes instantly on put, no polling
+
+        # One keep-alive session for all prompts (no TCP/TLS handshake per request)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=MAX_CONCURRENT_REQUESTS,
+            max_retries=Retry(
+                total=5,
+                read=0,  # A read timeout may mean the completion ran - never resend it
+                backoff_factor=2.0,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=None,  # Status retries apply to POST too
+                raise_on_status=False  # Last error response reaches raise_for_status()
+            )
+        )
+        self._session.mount("https://", adapter)
+
+        # Request constants built once (only "messages"/limits vary per call)
+        self._url = "https://api.deepseek.com/v1/chat/completions"
+        self._session.headers.update({"Content-Type": "application/json"})
+        self.set_api_key(api_key)
+        self._payload_base = {"model": self.model, "temperature": 0.7}
+
+        # Exact-match response cache (repeated quick-action prompts skip the network)
+        self._cache_path = Path("~/.telescope7_ai_cache.json").expanduser()
+        self._cache = self._load_cache()
+        self._cache_lock = Lock()  # Pool workers share the cache file
+        self._cache_unsaved = 0  # New entries since the last file write
+
+    def set_api_key(self, api_key):
+        """Update the key used by the session's Authorization header"""
+        self.api_key = api_key
+        self._session.headers["Authorization"] = f"Bearer {api_key}"
 
-    def set_prompt(self, prompt, image_path=None):
-        with self.lock:
-            self.prompt_queue.append((prompt, image_path))
+    def _load_cache(self):
+        """Load the cache file (oldest entry first, trimmed to CACHE_MAX_ENTRIES)"""
+        try:
+            with open(self._cache_path, "r") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return OrderedDict()
+        if not isinstance(cache, dict):
+            return OrderedDict()
+        return OrderedDict(list(cache.items())[-CACHE_MAX_ENTRIES:])
+
+    def _save_cache(self):
+        """Atomically rewrite the cache file (tmp + os.replace)"""
+        tmp_path = self._cache_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self._cache, f)
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            self.error_signal.emit(f"AI Cache Error: {str(e)}")
+
+    def set_prompt(self, messages, image_path=None, bypass_cache=False, request_id=0, cache_text=None):
+        """Queue a chat request (messages: list of {"role", "content"} dicts)
+
+        request_id is echoed on response_signal/chunk_signal so the caller can tell
+        overlapping replies apart. cache_text (question + coarse context) keys the
+        response cache; without it the full messages are used.
+        """
+        self.prompt_queue.put((messages, image_path, bypass_cache, request_id, cache_text))
 
     def run(self):
-        while self.running:
-            with self.lock:
-                if not self.prompt_queue:
-                    self.msleep(100)
-                    continue
-                prompt, image_path = self.prompt_queue.pop(0)
-
+        # Requests overlap on the session pool instead of queueing behind each other
+        pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+        while not self._stop_event.is_set():
             try:
-                # Base DeepSeek API configuration
-                url = "https://api.deepseek.com/v1/chat/completions"
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-
-                # Basic text prompt (image support simplified for small screens)
-                messages = [{"role": "user", "content": prompt}]
-                
-                payload = {
-                    "model": self.model,
-                    "messages": messages,
-                    "temperature": 0.7,
-                    "max_tokens": 500  # Reduced for compact screen output
-                }
-
-                # Send API request
-                response = requests.post(url, headers=headers, json=payload, timeout=30)
-                response.raise_for_status()
+                item = self.prompt_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is None:  # Shutdown sentinel from stop()
+                break
+            messages, image_path, bypass_cache, request_id, cache_text = item
+            pool.submit(self._request, messages, bypass_cache, request_id, cache_text)
+        # Drop queued prompts; in-flight requests finish on their own (bounded by the request timeout)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _cache_key(self, messages, cache_text=None):
+        """Identical (model, prompt + coarse context, temperature) -> same key"""
+        material = messages if cache_text is None else cache_text
+        return hashlib.sha256(json.dumps(
+            {"m": self.model, "msgs": material, "t": 0.7}, sort_keys=True
+        ).encode()).hexdigest()
+
+    def _lookup(self, key):
+        """Cached reply or None (a hit becomes the most recently used entry)"""
+        with self._cache_lock:
+            ai_response = self._cache.get(key)
+            if ai_response is not None:
+                self._cache.move_to_end(key)
+            return ai_response
+
+    def _store(self, key, ai_response):
+        with self._cache_lock:
+            self._cache[key] = ai_response
+            self._cache.move_to_end(key)
+            while len(self._cache) > CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)  # Evict least recently used
+            # File is rewritten every CACHE_SAVE_EVERY new entries (and on stop)
+            self._cache_unsaved += 1
+            if self._cache_unsaved >= CACHE_SAVE_EVERY:
+                self._save_cache()
+                self._cache_unsaved = 0
+
+    def _post(self, messages, request_id=0, stream=False):
+        """Send one chat completion and return the full reply text.
+
+        With stream=True the reply arrives as SSE deltas, each emitted on chunk_signal
+        tagged with request_id.
+        """
+        payload = {
+            **self._payload_base,
+            "messages": messages,
+            "max_tokens": 500  # Compact output for small screen
+        }
+        if stream:
+            payload["stream"] = True
+
+        # Send API request
+        with self._session.post(self._url, json=payload, stream=stream, timeout=30) as response:
+            response.raise_for_status()
+            if not stream:
                 result = response.json()
-                
                 # Extract AI response
-                ai_response = result["choices"][0]["message"]["content"]
-                self.response_signal.emit(ai_response)
+                return result["choices"][0]["message"]["content"]
+
+            parts = []
+            for line in response.iter_lines():
+                if not line or not line.startswith(b"data: "):
+                    continue
+                data = line[6:]
+                if data == b"[DONE]":
+                    break
+                event = json.loads(data)
+                if not event.get("choices"):
+                    continue
+                delta = event["choices"][0]["delta"].get("content") or ""
+                if delta:
+                    parts.append(delta)
+                    self.chunk_signal.emit(request_id, delta)
+            return "".join(parts)
+
+    def _request(self, messages, bypass_cache, request_id, cache_text):
+        """Run one chat completion (called on a pool worker thread)"""
+        try:
+            # Messages are used verbatim (stable system prefix first for provider caching)
+            key = self._cache_key(messages, cache_text)
+            cached = None if bypass_cache else self._lookup(key)
+            if cached is not None:
+                self.response_signal.emit(request_id, cached)
+                return
+
+            ai_response = self._post(messages, request_id, stream=True)
+            self.response_signal.emit(request_id, ai_response)  # Final full text (replaces streamed preview)
+            self._store(key, ai_response)
 
-            except Exception as e:
-                self.error_signal.emit(f"AI Error: {str(e)}")
+        except Exception as e:
+            self.error_signal.emit(f"AI Error: {str(e)}")
 
     def stop(self):
-        with self.lock:
-            self.running = False
-        self.wait()
+        self._stop_event.set()
+        self.prompt_queue.put_nowait(None)  # Wake run() immediately
+        self.wait(STOP_TIMEOUT_MS)
+        self._session.close()
+        # Flush cache entries not yet written
+        with self._cache_lock:
+            if self._cache_unsaved:
+                self._save_cache()
+                self._cache_unsaved = 0
 
 class DeepSeekWidget(QWidget):
     # Fixed: Rename signal to avoid conflict with analyze_image method
     image_analysis_request = pyqtSignal(str)  # Renamed from analyze_image
 
+    # Fixed system prompt (identical on every request -> cacheable prefix server-side)
+    STATIC_SYSTEM_PROMPT = (
+        "You assist with a small robotic telescope controlled by a Raspberry Pi 5.\n"
+        "- Display Resolution: 800×480\n"
+        "- Camera Resolution: 640x480\n"
+        "Provide concise, practical answers optimized for this setup. "
+        "Each user message starts with the live telescope telemetry."
+    )
+
     def __init__(self, ai_config):
         super().__init__()
         self.api_key = ai_config.get("deepseek_api_key", "")
@@ -81,10 +243,15 @@ class DeepSeekWidget(QWidget):
             "azimuth": 0.0,
             "gps": ""
         }
+        self._ctx_block = "Alt:0.0° Az:0.0° GPS:"  # Prompt context line (rebuilt on context change)
+        self._ctx_key = "Alt:0 Az:0 GPS:"  # Coarse context for response-cache keys
+        self._awaiting_first_chunk = False
+        self._request_id = 0  # Id of the newest prompt; replies to older ones are dropped
         
         # AI Thread initialization
         self.ai_thread = DeepSeekThread(self.api_key, self.model)
         self.ai_thread.response_signal.connect(self.update_ai_response)
+        self.ai_thread.chunk_signal.connect(self.append_ai_chunk)
         self.ai_thread.error_signal.connect(self.show_error)
         
         # UI Setup (optimized for 800×480 displays)
@@ -102,42 +269,32 @@ class DeepSeekWidget(QWidget):
         # Title
         title = QLabel("AI Assistant (DeepSeek)")
         title.setObjectName("title_label")
+        title.setProperty("cssClass", "title")
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet("font-size: 14px; font-weight: bold; color: #3498db;")
         layout.addWidget(title)
 
         # API Key Status (compact display)
         api_frame = QFrame()
-        api_frame.setStyleSheet("background-color: #f8f9fa; border-radius: 4px; padding: 8px;")
+        api_frame.setProperty("cssClass", "panel")
         api_layout = QHBoxLayout(api_frame)
         api_status = "Connected" if self.api_key else "No API Key (Enter Below)"
-        api_color = "#2ecc71" if self.api_key else "#e74c3c"
         self.api_status_label = QLabel(f"Status: {api_status}")
-        self.api_status_label.setStyleSheet(f"font-size: 11px; color: {api_color};")
+        self.api_status_label.setProperty("cssClass", "status")
+        self.api_status_label.setProperty("state", "ok" if self.api_key else "error")
         api_layout.addWidget(self.api_status_label)
         layout.addWidget(api_frame)
 
         # API Key Input (compact)
         key_group = QGroupBox("API Key (Required)")
-        key_group.setStyleSheet("font-size: 12px;")
+        key_group.setProperty("cssClass", "section")
         key_layout = QHBoxLayout(key_group)
         self.api_key_input = QLineEdit()
-        self.api_key_input.setStyleSheet("font-size: 11px; padding: 4px;")
+        self.api_key_input.setProperty("cssClass", "compact")
         self.api_key_input.setPlaceholderText("Enter DeepSeek API Key")
         self.api_key_input.setText(self.api_key)
         self.api_key_input.setEchoMode(QLineEdit.PasswordEchoOnEdit)
         self.save_key_btn = QPushButton("Save")
-        self.save_key_btn.setStyleSheet("""
-            QPushButton { 
-                background-color: #3498db; 
-                color: white; 
-                border: none; 
-                border-radius: 4px; 
-                padding: 4px 8px; 
-                font-size: 11px;
-            }
-            QPushButton:hover { background-color: #2980b9; }
-        """)
+        self.save_key_btn.setProperty("cssClass", "primary")
         self.save_key_btn.clicked.connect(self.save_api_key)
         key_layout.addWidget(self.api_key_input)
         key_layout.addWidget(self.save_key_btn)
@@ -145,37 +302,27 @@ class DeepSeekWidget(QWidget):
 
         # Prompt Input (small text area for 480px height)
         prompt_group = QGroupBox("Ask Astronomy Questions")
-        prompt_group.setStyleSheet("font-size: 12px;")
+        prompt_group.setProperty("cssClass", "section")
         prompt_layout = QVBoxLayout(prompt_group)
         self.prompt_input = QTextEdit()
-        self.prompt_input.setStyleSheet("font-size: 11px;")
+        self.prompt_input.setProperty("cssClass", "compact")
         self.prompt_input.setMaximumHeight(80)  # Reduced height for small screens
         self.prompt_input.setPlaceholderText("e.g., 'How to focus on the Moon?', 'Explain azimuth tracking'")
         prompt_layout.addWidget(self.prompt_input)
         
         # Send Button
         self.send_btn = QPushButton("Send to AI")
-        self.send_btn.setStyleSheet("""
-            QPushButton { 
-                background-color: #9c27b0; 
-                color: white; 
-                border: none; 
-                border-radius: 4px; 
-                padding: 6px 8px; 
-                font-size: 12px;
-            }
-            QPushButton:hover { background-color: #7b1fa2; }
-        """)
+        self.send_btn.setProperty("cssClass", "ai")
         self.send_btn.clicked.connect(self.send_prompt)
         prompt_layout.addWidget(self.send_btn)
         layout.addWidget(prompt_group)
 
         # AI Response (compact output for 800×480)
         response_group = QGroupBox("AI Response")
-        response_group.setStyleSheet("font-size: 12px;")
+        response_group.setProperty("cssClass", "section")
         response_layout = QVBoxLayout(response_group)
         self.response_output = QTextEdit()
-        self.response_output.setStyleSheet("font-size: 11px;")
+        self.response_output.setProperty("cssClass", "compact")
         self.response_output.setMaximumHeight(180)  # Critical for 480px height
         self.response_output.setReadOnly(True)
         response_layout.addWidget(self.response_output)
@@ -186,21 +333,9 @@ class DeepSeekWidget(QWidget):
         self.moon_help_btn = QPushButton("Moon Tracking Help")
         self.sun_help_btn = QPushButton("Sun Safety Tips")
         self.camera_help_btn = QPushButton("Camera Settings")
-        # Style for small buttons
-        quick_btn_style = """
-            QPushButton { 
-                background-color: #3498db; 
-                color: white; 
-                border: none; 
-                border-radius: 4px; 
-                padding: 4px 6px; 
-                font-size: 10px;
-            }
-            QPushButton:hover { background-color: #2980b9; }
-        """
-        self.moon_help_btn.setStyleSheet(quick_btn_style)
-        self.sun_help_btn.setStyleSheet(quick_btn_style)
-        self.camera_help_btn.setStyleSheet(quick_btn_style)
+        # Style for small buttons (app.qss)
+        for btn in (self.moon_help_btn, self.sun_help_btn, self.camera_help_btn):
+            btn.setProperty("cssClass", "quick")
         # Connect quick actions to pre-filled prompts
         self.moon_help_btn.clicked.connect(lambda: self.load_quick_prompt("Explain how to optimize moon tracking for a small telescope (800×480 display)"))
         self.sun_help_btn.clicked.connect(lambda: self.load_quick_prompt("List critical safety tips for solar observation with a telescope"))
@@ -210,6 +345,16 @@ class DeepSeekWidget(QWidget):
         quick_layout.addWidget(self.camera_help_btn)
         layout.addLayout(quick_layout)
 
+        # Toast line for info messages (non-blocking, replaces QMessageBox.information)
+        self.toast_label = QLabel("")
+        self.toast_label.setProperty("cssClass", "toast")
+        self.toast_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.toast_label)
+        self._toast_timer = QTimer(self)
+        self._toast_timer.setSingleShot(True)
+        self._toast_timer.setInterval(TOAST_MS)
+        self._toast_timer.timeout.connect(self.toast_label.clear)
+
     # ======================
     # FIXED: Robust update_context (handles string/dict input + error handling)
     # ======================
@@ -235,17 +380,12 @@ class DeepSeekWidget(QWidget):
                 # Clean up string and extract values (basic parsing - adjust if needed)
                 # Example string format: "Altitude: 10.5°, Azimuth: 200.0°, GPS: 40.7128° N, -74.0060° W"
                 context_clean = context.strip()
-                if "Altitude:" in context_clean:
-                    # Extract altitude (number after "Altitude:")
-                    alt_part = context_clean.split("Altitude:")[1].split("°")[0].strip()
-                    current_alt = float(alt_part) if alt_part.replace(".", "").isdigit() else 0.0
-                if "Azimuth:" in context_clean:
-                    # Extract azimuth (number after "Azimuth:")
-                    az_part = context_clean.split("Azimuth:")[1].split("°")[0].strip()
-                    current_az = float(az_part) if az_part.replace(".", "").isdigit() else 0.0
-                if "GPS:" in context_clean:
-                    # Extract GPS string (everything after "GPS:")
-                    gps_str = context_clean.split("GPS:")[1].strip()
+                # Each field is parsed independently (a missing one keeps its default)
+                current_alt = _ctx_angle(context_clean, "Altitude:", current_alt)
+                current_az = _ctx_angle(context_clean, "Azimuth:", current_az)
+                _, sep, gps_rest = context_clean.partition("GPS:")
+                if sep:
+                    gps_str = gps_rest.strip()
             
             # Case 3: Unexpected input type (log warning but don't crash)
             else:
@@ -276,6 +416,16 @@ class DeepSeekWidget(QWidget):
             "azimuth": round(float(current_az), 1),    # Ensure float to avoid errors
             "gps": str(gps_str)                        # Ensure string to avoid errors
         }
+        # Prompt context line built once per update (full .1f precision for pointing questions)
+        self._ctx_block = (
+            f"Alt:{self.telescope_context['altitude']:.1f}° "
+            f"Az:{self.telescope_context['azimuth']:.1f}° GPS:{self.telescope_context['gps']}"
+        )
+        # Whole-degree context for cache keys (nearby pointings share answers)
+        self._ctx_key = (
+            f"Alt:{round(self.telescope_context['altitude'])} "
+            f"Az:{round(self.telescope_context['azimuth'])} GPS:{self.telescope_context['gps']}"
+        )
         # Update status label with context (debug/transparency)
         self.api_status_label.setText(
             f"Status: Connected | Alt:{self.telescope_context['altitude']}° | Az:{self.telescope_context['azimuth']}°"
@@ -283,15 +433,26 @@ class DeepSeekWidget(QWidget):
 
     def save_api_key(self):
         self.api_key = self.api_key_input.text().strip()
-        self.ai_thread.api_key = self.api_key
+        self.ai_thread.set_api_key(self.api_key)
         # Update status display
         if self.api_key:
             self.api_status_label.setText("Status: Connected")
-            self.api_status_label.setStyleSheet("font-size: 11px; color: #2ecc71;")
-            QMessageBox.information(self, "API Key Saved", "DeepSeek API key updated successfully!")
+            self._set_api_state("ok")
+            self._toast("DeepSeek API key saved")
         else:
             self.api_status_label.setText("Status: No API Key")
-            self.api_status_label.setStyleSheet("font-size: 11px; color: #e74c3c;")
+            self._set_api_state("error")
+
+    def _toast(self, msg):
+        """Show an info message for TOAST_MS without blocking the event loop"""
+        self.toast_label.setText(msg)
+        self._toast_timer.start()  # Restart: a newer message gets the full duration
+
+    def _set_api_state(self, state):
+        """Switch the status colour (re-polish so the [state] selector re-applies)"""
+        self.api_status_label.setProperty("state", state)
+        self.api_status_label.style().unpolish(self.api_status_label)
+        self.api_status_label.style().polish(self.api_status_label)
 
     def load_quick_prompt(self, prompt):
         self.prompt_input.setText(prompt)
@@ -307,46 +468,54 @@ class DeepSeekWidget(QWidget):
             return
         
         # Integrate telescope context into the prompt (core feature)
-        context = self.telescope_context
-        full_prompt = f"""
-        Context: 
-        - Telescope Altitude: {context['altitude']}°
-        - Telescope Azimuth: {context['azimuth']}°
-        - GPS Location: {context['gps']}
-        - Display Resolution: 800×480
-        - Camera Resolution: 640x480
-
-        Question: {base_prompt}
-        
-        Note: Provide concise, practical answers optimized for a small robotic telescope (Raspberry Pi 5).
-        """
+        # Only the short user message varies (pre-formatted context line)
+        messages = [
+            {"role": "system", "content": self.STATIC_SYSTEM_PROMPT},
+            {"role": "user", "content": f"{self._ctx_block}\nQ: {base_prompt}"}
+        ]
         
         # Clear previous response
         self.response_output.setText("AI is thinking...")
+        self._awaiting_first_chunk = True
         # Send full context-aware prompt to AI thread
-        self.ai_thread.set_prompt(full_prompt)
-
-    def update_ai_response(self, response):
+        self._request_id += 1
+        self.ai_thread.set_prompt(messages, request_id=self._request_id,
+                                  cache_text=f"{self._ctx_key}\nQ: {base_prompt}")
+
+    def update_ai_response(self, request_id, response):
+        if request_id != self._request_id:
+            return  # Reply to a superseded prompt
+        self._awaiting_first_chunk = False
         self.response_output.setText(response)
 
+    def append_ai_chunk(self, request_id, delta):
+        """Show streamed text as it arrives (time-to-first-token instead of full reply)"""
+        if request_id != self._request_id:
+            return  # Stream of a superseded prompt (would interleave with the current one)
+        if self._awaiting_first_chunk:
+            self.response_output.clear()  # Drop the "AI is thinking..." placeholder
+            self._awaiting_first_chunk = False
+        self.response_output.moveCursor(QTextCursor.End)
+        self.response_output.insertPlainText(delta)
+
     # Fixed: Rename method to avoid conflict with signal
     def analyze_image_file(self, image_path):
         # Context-aware image analysis prompt
-        context = self.telescope_context
-        prompt = f"""
-        Context:
-        - Telescope Altitude: {context['altitude']}°
-        - Telescope Azimuth: {context['azimuth']}°
-        - GPS Location: {context['gps']}
-        - Camera Resolution: 640x480
-
-        Analyze this astronomical image (path: {image_path}): 
-        1. Identify the celestial object (Moon/Sun/stars/planets)
-        2. Assess image quality (exposure, focus, noise, clarity)
-        3. Suggest improvements tailored to the telescope's current position and camera settings
-        """
-        self.ai_thread.set_prompt(prompt, image_path)
+        messages = [
+            {"role": "system", "content": self.STATIC_SYSTEM_PROMPT},
+            {"role": "user", "content": (
+                f"{self._ctx_block}\n"
+                f"Analyze this astronomical image (path: {image_path}):\n"
+                "1. Identify the celestial object (Moon/Sun/stars/planets)\n"
+                "2. Assess image quality (exposure, focus, noise, clarity)\n"
+                "3. Suggest improvements tailored to the telescope's current position and camera settings"
+            )}
+        ]
+        self._request_id += 1
+        self.ai_thread.set_prompt(messages, image_path, request_id=self._request_id,
+                                  cache_text=f"{self._ctx_key}\nImage: {image_path}")
         self.response_output.setText("Analyzing image...")
+        self._awaiting_first_chunk = True
 
     def show_error(self, error_msg):
         QMessageBox.critical(self, "AI Error", error_msg)
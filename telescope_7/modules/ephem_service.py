@@ -0,0 +1,49 @@
+# ==============================================
+# Shared Ephemeris Service (one timer for all consumers)
+# ==============================================
+import ephem
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+PHASE_INTERVAL_MS = 60000  # Moon phase refresh (1 min)
+PHASE_TOLERANCE = 0.05     # % illumination change before re-emitting
+
+class EphemService(QObject):
+    """Computes the moon phase on one app-wide QTimer and broadcasts changes"""
+    phase_changed = pyqtSignal(float)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self._moon = ephem.Moon()  # Reused (compute() updates it in place)
+        self._last = None
+        self.phase = None          # Latest phase (%) for late subscribers
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(PHASE_INTERVAL_MS)
+        self._timer.timeout.connect(self._tick)
+        self._timer.start()
+        self._tick()  # Initial value
+
+    def _tick(self):
+        try:
+            self._moon.compute(ephem.now())
+            phase = self._moon.phase  # 0 = new, 50 = quarter, 100 = full
+        except Exception as e:
+            self.error_signal.emit(f"Moon Phase Error: {str(e)[:30]}...")
+            return
+        self.phase = phase
+        if self._last is None or abs(phase - self._last) > PHASE_TOLERANCE:
+            self._last = phase
+            self.phase_changed.emit(phase)
+
+    def stop(self):
+        self._timer.stop()
+
+_ephem_service = None
+
+def get_ephem_service():
+    """Return the shared EphemService (created on first use, GUI thread)"""
+    global _ephem_service
+    if _ephem_service is None:
+        _ephem_service = EphemService()
+    return _ephem_service
@@ -1,12 +1,19 @@
 import ephem
+import math
+import time
+import bisect
 import datetime
-from threading import Lock
+from threading import Lock, Event
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
     QLabel, QCheckBox, QDoubleSpinBox, QGroupBox, QFrame,
     QMessageBox, QSizePolicy
 )
 from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer
+from ephem_service import get_ephem_service
+
+TOAST_MS = 3000  # Info message display time
+POSITION_TOLERANCE = 0.05  # ° - half the 0.1° display precision
 
 # Moon tracking thread (Pi 5 / 800×480 Optimized)
 class MoonTrackingThread(QThread):
@@ -16,63 +23,91 @@ class MoonTrackingThread(QThread):
 
     def __init__(self, lat, lon):
         super().__init__()
-        self.running = True
         self.lock = Lock()
+        self._stop = Event()      # Set by stop() -> instant shutdown
+        self._tracking = Event()  # Set while auto-track is on (thread idles otherwise)
         self.lat = float(lat)
         self.lon = float(lon)
         self.auto_track = False
         self.update_interval = 2  # 2s update (Pi 5 responsive)
+        self.last_position = (0.0, 0.0)  # Latest (alt, az), written by run()
+        self._last_time = 0.0            # monotonic time of last_position
+        self._last_alt = self._last_az = None  # Last emitted position (dedupe)
+
+        # Reused ephem objects (only date and, on change, lat/lon are updated)
+        self._observer = ephem.Observer()
+        self._observer.pressure = 0  # Disable refraction (faster calculation)
+        self._observer.lat = math.radians(self.lat)  # Float = radians (no string parsing)
+        self._observer.lon = math.radians(self.lon)
+        self._moon = ephem.Moon()
 
     def set_location(self, lat, lon):
         """Thread-safe location update (decimal precision)"""
         with self.lock:
             self.lat = float(lat)
             self.lon = float(lon)
+            self._observer.lat = math.radians(self.lat)
+            self._observer.lon = math.radians(self.lon)
+        self._last_alt = self._last_az = None
         self.status_signal.emit(f"📍 Location updated: {lat:.2f}° N, {lon:.2f}° E")
 
     def set_auto_track(self, enable):
         """Thread-safe auto-track toggle"""
         with self.lock:
             self.auto_track = enable
+        self._last_alt = self._last_az = None  # Re-enabling always re-emits (re-slews)
+        if enable:
+            self._tracking.set()
+        else:
+            self._tracking.clear()
         status = "ENABLED" if enable else "DISABLED"
         self.status_signal.emit(f"🔄 Moon auto-track: {status}")
 
     def calculate_moon_position(self):
         """Pi 5 optimized moon position calculation"""
         try:
-            observer = ephem.Observer()
-            observer.lat = str(self.lat)
-            observer.lon = str(self.lon)
-            observer.date = ephem.now()  # Faster than datetime (ephem native)
-            observer.pressure = 0  # Disable refraction (faster calculation)
-            moon = ephem.Moon(observer)
-            
-            # Convert radians to degrees
-            alt = float(moon.alt) * 180.0 / ephem.pi
-            az = float(moon.az) * 180.0 / ephem.pi
-            return alt, az
+            with self.lock:
+                self._observer.date = ephem.now()  # Faster than datetime (ephem native)
+                self._moon.compute(self._observer)
+                # Convert radians to degrees
+                return math.degrees(self._moon.alt), math.degrees(self._moon.az)
         except Exception as e:
             self.error_signal.emit(f"Moon Calculation Error: {str(e)[:30]}...")
             return 0.0, 0.0
 
+    def get_last_position(self):
+        """Latest (alt, az) from the tracking loop, or None if stale (auto-track off)"""
+        with self.lock:
+            if time.monotonic() - self._last_time > 2 * self.update_interval:
+                return None
+            return self.last_position
+
     def run(self):
         """Main tracking loop (low CPU for Pi 5)"""
-        while self.running:
+        while not self._stop.is_set():
+            # Sleep until auto-track is enabled (stop() sets _tracking to release this)
+            self._tracking.wait()
+            if self._stop.is_set():
+                break
+
+            alt, az = self.calculate_moon_position()
             with self.lock:
-                auto_track = self.auto_track
-                update_interval = self.update_interval
+                self.last_position = (alt, az)
+                self._last_time = time.monotonic()
 
-            if auto_track:
-                alt, az = self.calculate_moon_position()
+            # Skip the emit (label repaint + slew_to_moon downstream) below display precision
+            if (self._last_alt is None or abs(alt - self._last_alt) >= POSITION_TOLERANCE
+                    or abs(az - self._last_az) >= POSITION_TOLERANCE):
+                self._last_alt, self._last_az = alt, az
                 self.position_signal.emit(alt, az)
-            
-            # Reduced sleep for responsiveness (800×480)
-            self.msleep(update_interval * 500)
+
+            # Wakes early if stop() is called
+            self._stop.wait(self.update_interval)
 
     def stop(self):
         """Graceful thread shutdown"""
-        with self.lock:
-            self.running = False
+        self._stop.set()
+        self._tracking.set()  # Release a pending _tracking.wait()
         self.wait()
 
 # Main Moon Widget (800×480 Optimized)
@@ -81,10 +116,19 @@ class MoonTrackingWidget(QWidget):
     lat_lon_updated = pyqtSignal(float, float)
     auto_track_check = pyqtSignal(bool)
 
+    # (upper bound exclusive, name) - phase < bound selects the name
+    _PHASES = [
+        (10, "New Moon"), (40, "Waxing Crescent"), (60, "First Quarter"),
+        (90, "Waxing Gibbous"), (100, "Full Moon"), (140, "Waning Gibbous"),
+        (160, "Last Quarter"), (361, "Waning Crescent")
+    ]
+    _PHASE_THRESHOLDS = [t for t, _ in _PHASES]
+
     def __init__(self, lat, lon):
         super().__init__()
         self.lat = float(lat)
         self.lon = float(lon)
+        self._last_phase_text = None
 
         # Tracking thread (Pi 5 optimized)
         self.tracking_thread = MoonTrackingThread(lat, lon)
@@ -106,62 +150,56 @@ class MoonTrackingWidget(QWidget):
         # Title (800×480 optimized)
         title = QLabel("Lunar Tracking")
         title.setObjectName("title_label")
+        title.setProperty("cssClass", "title")
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet("font-size: 14px; font-weight: bold; color: #3498db;")
         layout.addWidget(title)
 
         # Current Moon Position (compact display)
         pos_frame = QFrame()
-        pos_frame.setStyleSheet("background-color: #f8f9fa; border-radius: 4px; padding: 8px;")
+        pos_frame.setProperty("cssClass", "panel")
         pos_layout = QVBoxLayout(pos_frame)
         self.alt_label = QLabel(f"Moon Altitude: -- °")
         self.az_label = QLabel(f"Moon Azimuth: -- °")
-        self.alt_label.setStyleSheet("font-size: 11px; color: #2c3e50; font-weight: bold;")
-        self.az_label.setStyleSheet("font-size: 11px; color: #2c3e50; font-weight: bold;")
+        self.alt_label.setProperty("cssClass", "value")
+        self.az_label.setProperty("cssClass", "value")
         pos_layout.addWidget(self.alt_label)
         pos_layout.addWidget(self.az_label)
         layout.addWidget(pos_frame)
 
         # Location Settings (decimal precision for astronomy)
         loc_group = QGroupBox("Location (Lat/Lon)")
-        loc_group.setStyleSheet("font-size: 12px;")
+        loc_group.setProperty("cssClass", "section")
         loc_layout = QHBoxLayout(loc_group)
         
         # Latitude (DoubleSpinBox for decimal precision)
         lat_layout = QHBoxLayout()
-        lat_layout.addWidget(QLabel("Lat:", styleSheet="font-size: 11px;"))
+        lat_label = QLabel("Lat:")
+        lat_label.setProperty("cssClass", "compact")
+        lat_layout.addWidget(lat_label)
         self.lat_spin = QDoubleSpinBox()
         self.lat_spin.setRange(-90.0, 90.0)
         self.lat_spin.setDecimals(4)
         self.lat_spin.setValue(self.lat)
-        self.lat_spin.setStyleSheet("font-size: 11px; padding: 2px;")
+        self.lat_spin.setProperty("cssClass", "compact")
         self.lat_spin.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         lat_layout.addWidget(self.lat_spin)
         
         # Longitude (DoubleSpinBox for decimal precision)
         lon_layout = QHBoxLayout()
-        lon_layout.addWidget(QLabel("Lon:", styleSheet="font-size: 11px;"))
+        lon_label = QLabel("Lon:")
+        lon_label.setProperty("cssClass", "compact")
+        lon_layout.addWidget(lon_label)
         self.lon_spin = QDoubleSpinBox()
         self.lon_spin.setRange(-180.0, 180.0)
         self.lon_spin.setDecimals(4)
         self.lon_spin.setValue(self.lon)
-        self.lon_spin.setStyleSheet("font-size: 11px; padding: 2px;")
+        self.lon_spin.setProperty("cssClass", "compact")
         self.lon_spin.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         lon_layout.addWidget(self.lon_spin)
         
         # Save Button
         self.save_loc_btn = QPushButton("Save")
-        self.save_loc_btn.setStyleSheet("""
-            QPushButton { 
-                background-color: #3498db; 
-                color: white; 
-                border: none; 
-                border-radius: 4px; 
-                padding: 4px 8px; 
-                font-size: 11px;
-            }
-            QPushButton:hover { background-color: #2980b9; }
-        """)
+        self.save_loc_btn.setProperty("cssClass", "primary")
         self.save_loc_btn.clicked.connect(self.update_location)
         
         # Add to layout
@@ -176,18 +214,8 @@ class MoonTrackingWidget(QWidget):
         self.auto_track_btn = QCheckBox("Auto Track Moon")
         
         # Style buttons
-        self.slew_btn.setStyleSheet("""
-            QPushButton { 
-                background-color: #3498db; 
-                color: white; 
-                border: none; 
-                border-radius: 4px; 
-                padding: 6px 8px; 
-                font-size: 12px;
-            }
-            QPushButton:hover { background-color: #2980b9; }
-        """)
-        self.auto_track_btn.setStyleSheet("font-size: 11px;")
+        self.slew_btn.setProperty("cssClass", "action")
+        self.auto_track_btn.setProperty("cssClass", "compact")
         
         # Connect buttons
         self.slew_btn.clicked.connect(self.slew_to_moon_position)
@@ -200,20 +228,30 @@ class MoonTrackingWidget(QWidget):
 
         # Moon Phase Info (800×480 compact)
         phase_frame = QFrame()
-        phase_frame.setStyleSheet("background-color: #f8f9fa; border-radius: 4px; padding: 8px;")
+        phase_frame.setProperty("cssClass", "panel")
         phase_layout = QVBoxLayout(phase_frame)
         self.phase_label = QLabel("Moon Phase: Calculating...")
-        self.phase_label.setStyleSheet("font-size: 11px; color: #666;")
+        self.phase_label.setProperty("cssClass", "hint")
         phase_layout.addWidget(self.phase_label)
         
-        # Phase update timer (Pi 5 optimized)
-        self.phase_timer = QTimer()
-        self.phase_timer.setInterval(60000)  # Update every minute
-        self.phase_timer.timeout.connect(self.update_moon_phase)
-        self.phase_timer.start()
-        self.update_moon_phase()  # Initial update
+        # Phase comes from the shared app-wide service (one timer/compute for all tabs)
+        self.ephem_service = get_ephem_service()
+        self.ephem_service.phase_changed.connect(self.update_moon_phase)
+        self.ephem_service.error_signal.connect(self.show_phase_error)
+        if self.ephem_service.phase is not None:
+            self.update_moon_phase(self.ephem_service.phase)  # Initial update
         layout.addWidget(phase_frame)
 
+        # Toast line for info messages (non-blocking, replaces QMessageBox.information)
+        self.toast_label = QLabel("")
+        self.toast_label.setProperty("cssClass", "toast")
+        self.toast_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.toast_label)
+        self._toast_timer = QTimer(self)
+        self._toast_timer.setSingleShot(True)
+        self._toast_timer.setInterval(TOAST_MS)
+        self._toast_timer.timeout.connect(self.toast_label.clear)
+
     def update_status(self, status_msg):
         """Update status messages (for debugging)"""
         pass  # Can connect to main status bar if needed
@@ -225,39 +263,31 @@ class MoonTrackingWidget(QWidget):
         # Emit position for motor control
         self.slew_to_moon.emit(alt, az)
 
-    def update_moon_phase(self):
-        """Calculate and display moon phase"""
-        try:
-            moon = ephem.Moon(ephem.now())
-            phase = moon.phase  # 0 = new, 50 = first quarter, 100 = full
-            
-            # Determine phase text
-            if phase < 10:
-                phase_text = "New Moon"
-            elif phase < 40:
-                phase_text = "Waxing Crescent"
-            elif phase < 60:
-                phase_text = "First Quarter"
-            elif phase < 90:
-                phase_text = "Waxing Gibbous"
-            elif phase < 100:
-                phase_text = "Full Moon"
-            elif phase < 140:
-                phase_text = "Waning Gibbous"
-            elif phase < 160:
-                phase_text = "Last Quarter"
-            else:
-                phase_text = "Waning Crescent"
-                
-            self.phase_label.setText(f"Moon Phase: {phase_text} ({phase:.1f}%)")
-        except Exception as e:
-            self.phase_label.setText(f"Moon Phase: Error ({str(e)[:30]}...)")
+    def update_moon_phase(self, phase):
+        """Display moon phase (0 = new, 50 = first quarter, 100 = full)"""
+        # Determine phase text (binary search over static thresholds)
+        idx = bisect.bisect_right(self._PHASE_THRESHOLDS, phase)
+        phase_text = self._PHASES[min(idx, len(self._PHASES) - 1)][1]
+
+        # Skip the relabel (and repaint) when nothing visible changed
+        txt = f"Moon Phase: {phase_text} ({phase:.1f}%)"
+        if txt != self._last_phase_text:
+            self.phase_label.setText(txt)
+            self._last_phase_text = txt
+
+    def show_phase_error(self, error_msg):
+        self.phase_label.setText(f"Moon Phase: {error_msg}")
+        self._last_phase_text = None
 
     def slew_to_moon_position(self):
         """Slew telescope to current moon position"""
-        alt, az = self.tracking_thread.calculate_moon_position()
+        # Reuse the tracking thread's latest fix (no ephem compute on the GUI thread)
+        pos = self.tracking_thread.get_last_position()
+        if pos is None:  # Auto-track off - nothing recent cached
+            pos = self.tracking_thread.calculate_moon_position()
+        alt, az = pos
         self.update_moon_position(alt, az)
-        QMessageBox.information(self, "Slew to Moon", f"Moving to Moon position:\nAlt: {alt:.1f}° | Az: {az:.1f}°")
+        self._toast(f"Moving to Moon: Alt {alt:.1f}° | Az {az:.1f}°")
 
     def toggle_auto_track(self, state):
         """Toggle auto-tracking on/off"""
@@ -266,7 +296,7 @@ class MoonTrackingWidget(QWidget):
         self.auto_track_check.emit(enable)
         # Status update
         status = "Enabled" if enable else "Disabled"
-        QMessageBox.information(self, "Auto Track", f"Moon auto-tracking {status}")
+        self._toast(f"Moon auto-tracking {status}")
 
     def update_location(self):
         """Update location coordinates"""
@@ -274,9 +304,12 @@ class MoonTrackingWidget(QWidget):
         self.lon = self.lon_spin.value()
         self.tracking_thread.set_location(self.lat, self.lon)
         self.lat_lon_updated.emit(self.lat, self.lon)
-        # Update moon phase with new location
-        self.update_moon_phase()
-        QMessageBox.information(self, "Location Updated", f"New location:\nLat: {self.lat:.4f}° | Lon: {self.lon:.4f}°")
+        self._toast(f"Location updated: Lat {self.lat:.4f}° | Lon {self.lon:.4f}°")
+
+    def _toast(self, msg):
+        """Show an info message for TOAST_MS without blocking the event loop"""
+        self.toast_label.setText(msg)
+        self._toast_timer.start()  # Restart: a newer message gets the full duration
 
     def show_error(self, error_msg):
         """Show error messages"""
@@ -285,4 +318,6 @@ class MoonTrackingWidget(QWidget):
     def close(self):
         """Cleanup on widget close"""
         self.tracking_thread.stop()
-        self.phase_timer.stop()
\ No newline at end of file
+        # Shared service keeps running for other consumers - just unsubscribe
+        self.ephem_service.phase_changed.disconnect(self.update_moon_phase)
+        self.ephem_service.error_signal.disconnect(self.show_phase_error)
\ No newline at end of file
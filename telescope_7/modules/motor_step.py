@@ -0,0 +1,49 @@
+"""Motor position integrator shared by the altitude/azimuth threads.
+
+Compiled with numba when it is installed (one native call per 100ms tick);
+falls back to the identical pure-Python functions otherwise.
+"""
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (plain Python functions)"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Position tolerance (°) - matches the motor threads' hold check
+HOLD_TOLERANCE = 0.1
+
+@njit(cache=True)
+def step(cur, tgt, spd, dt, lo, hi):
+    """Move cur toward tgt at spd °/s for dt s, clamped to [lo, hi].
+
+    Returns (new_position, direction): 1 forward, -1 backward, 0 hold.
+    """
+    diff = tgt - cur
+    if abs(diff) < HOLD_TOLERANCE:
+        return cur, 0
+    if diff > 0:
+        new = cur + spd * dt
+        direction = 1
+    else:
+        new = cur - spd * dt
+        direction = -1
+    if new < lo:
+        new = lo
+    elif new > hi:
+        new = hi
+    return new, direction
+
+@njit(cache=True)
+def step_wrapped(cur, diff, spd, dt):
+    """Move cur along a signed shortest-path diff at spd °/s for dt s, wrapped to 0-360°.
+
+    Returns (new_position, direction): 1 forward, -1 backward, 0 hold.
+    """
+    if abs(diff) < HOLD_TOLERANCE:
+        return cur, 0
+    if diff > 0:
+        return (cur + spd * dt) % 360.0, 1
+    return (cur - spd * dt) % 360.0, -1
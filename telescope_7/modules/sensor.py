@@ -2,10 +2,12 @@
 # LSM303DLH Sensor Widget (REAL DATA ONLY | NO BME | NO DUMMY)
 # ==============================================
 import sys
-import time
 import math
-import smbus2
-from threading import Lock
+import struct
+import ctypes
+import numpy as np
+from array import array
+from threading import Lock, Event
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, 
     QPushButton, QGridLayout, QSizePolicy, QMessageBox
@@ -23,7 +25,15 @@ MAG_ADDR = 0x1E
 # Accelerometer Registers
 ACCEL_CTRL_REG1_A = 0x20
 ACCEL_CTRL_REG4_A = 0x23
+ACCEL_CTRL_REG5_A = 0x24
 ACCEL_OUT_X_L_A = 0x28
+ACCEL_FIFO_CTRL_REG_A = 0x2E
+ACCEL_FIFO_SRC_REG_A = 0x2F
+
+# Accelerometer FIFO (32 samples). The plain LSM303DLH has no FIFO - only enable this
+# on FIFO-capable parts (e.g. LSM303DLHC); each tick then averages everything buffered.
+ACCEL_FIFO = False
+ACCEL_FIFO_DEPTH = 32
 
 # Magnetometer Registers
 MAG_CRA_REG_M = 0x00
@@ -31,12 +41,60 @@ MAG_CRB_REG_M = 0x01
 MAG_MR_REG_M = 0x02
 MAG_OUT_X_H_M = 0x03
 
+# Raw sample decoders (signed 16-bit X/Y/Z)
+_ACC_UNPACK = struct.Struct("<hhh").unpack_from  # Accel: L,H byte order
+_MAG_UNPACK = struct.Struct(">hhh").unpack_from  # Mag: H,L byte order
+
+# Scale factors
+_ACC_LSB = 0.000061  # g per LSB (±2g range)
+_MAG_LSB = 0.061     # mG per LSB (±1.3g range)
+
+_AXES_IDLE = "X: --\nY: --\nZ: --"  # Axis label text while the sensor is off
+SENSOR_UI_MS = 100  # Label refresh interval (matches the 10Hz read rate)
+ACCEL_DISPLAY_STEP = 0.005  # g  - half of the 0.01 label resolution
+MAG_DISPLAY_STEP = 0.05     # mG - half of the 0.1 label resolution
+REINIT_BACKOFF_MIN = 1.0   # s - first re-init delay after a read error
+REINIT_BACKOFF_MAX = 10.0  # s - cap (gives up after a failed attempt at the cap)
+
+def _buffer_view(msg):
+    """ctypes array aliasing an i2c_msg's buffer (struct-unpackable without copying)"""
+    return (ctypes.c_char * msg.len).from_address(ctypes.addressof(msg.buf.contents))
+
+def _moved(new, old, step):
+    """True if any axis changed by at least `step`"""
+    return (abs(new[0] - old[0]) >= step or abs(new[1] - old[1]) >= step
+            or abs(new[2] - old[2]) >= step)
+
 # ==============================================
 # LSM303DLH Driver (REAL DATA ONLY)
 # ==============================================
 class LSM303DLH:
+    """LSM303DLH driver.
+
+    SPSC: the read_* methods are only called from SensorThread.run (no other readers),
+    so they take no lock; self.lock guards initialize()/close() only.
+    """
     def __init__(self, i2c_bus=1):
-        self.bus = smbus2.SMBus(i2c_bus)
+        # smbus2 is imported on first use (faster startup, importable on non-Pi hosts)
+        try:
+            import smbus2
+            self.bus = smbus2.SMBus(i2c_bus)
+            self._available = True
+            # Preallocated I2C_RDWR messages, reused every read (no per-tick buffers)
+            self._msg = msg = smbus2.i2c_msg
+            acc_w = msg.write(ACCEL_ADDR, [ACCEL_OUT_X_L_A | 0x80])
+            acc_r = msg.read(ACCEL_ADDR, 6)
+            mag_w = msg.write(MAG_ADDR, [MAG_OUT_X_H_M])
+            mag_r = msg.read(MAG_ADDR, 6)
+            self._acc_msgs = (acc_w, acc_r)
+            self._mag_msgs = (mag_w, mag_r)
+            self._all_msgs = (acc_w, acc_r, mag_w, mag_r)
+            # Zero-copy views of the kernel-filled read buffers (decoded with unpack_from)
+            self._acc_buf = _buffer_view(acc_r)
+            self._mag_buf = _buffer_view(mag_r)
+        except ImportError:
+            self.bus = None
+            self._available = False
         self.accel_addr = ACCEL_ADDR
         self.mag_addr = MAG_ADDR
         self.lock = Lock()
@@ -44,6 +102,8 @@ class LSM303DLH:
 
     def initialize(self):
         """Initialize LSM303DLH (REAL HARDWARE ONLY)"""
+        if not self._available:
+            raise RuntimeError("smbus2 not installed - sensor disabled")
         with self.lock:
             try:
                 # Initialize Accelerometer (100Hz, normal power)
@@ -54,6 +114,10 @@ class LSM303DLH:
                 self.bus.write_byte_data(self.mag_addr, MAG_CRA_REG_M, 0x18)  # 75Hz output rate
                 self.bus.write_byte_data(self.mag_addr, MAG_CRB_REG_M, 0x20)  # ±1.3g range
                 self.bus.write_byte_data(self.mag_addr, MAG_MR_REG_M, 0x00)   # Continuous conversion mode
+
+                if ACCEL_FIFO:
+                    self.bus.write_byte_data(self.accel_addr, ACCEL_CTRL_REG5_A, 0x40)     # FIFO_EN
+                    self.bus.write_byte_data(self.accel_addr, ACCEL_FIFO_CTRL_REG_A, 0x80)  # Stream mode
                 
                 self.initialized = True
                 return True
@@ -65,58 +129,87 @@ class LSM303DLH:
         if not self.initialized:
             raise RuntimeError("LSM303DLH not initialized")
         
-        with self.lock:
-            try:
-                # Read 6 bytes (X/Y/Z low/high)
-                data = self.bus.read_i2c_block_data(self.accel_addr, ACCEL_OUT_X_L_A | 0x80, 6)
-                
-                # Convert to raw values
-                x = (data[1] << 8) | data[0]
-                y = (data[3] << 8) | data[2]
-                z = (data[5] << 8) | data[4]
-                
-                # Convert to signed 16-bit values
-                x = x if x < 32768 else x - 65536
-                y = y if y < 32768 else y - 65536
-                z = z if z < 32768 else z - 65536
-                
-                # Convert to g (±2g range: 1 LSB = 0.000061 g)
-                x_g = x * 0.000061
-                y_g = y * 0.000061
-                z_g = z * 0.000061
-                
-                return (round(x_g, 2), round(y_g, 2), round(z_g, 2))
-            except Exception as e:
-                raise RuntimeError(f"Failed to read accelerometer: {str(e)}")
+        try:
+            # Read 6 bytes (X/Y/Z low/high) - register write + read in one transaction
+            self.bus.i2c_rdwr(*self._acc_msgs)
+            return self._convert_accel(self._acc_buf)
+        except Exception as e:
+            raise RuntimeError(f"Failed to read accelerometer: {str(e)}")
+
+    def _convert_accel(self, data):
+        """Little-endian X/Y/Z bytes -> g"""
+        # Signed 16-bit unpack in C (replaces shift/OR/sign-fix per axis)
+        x, y, z = _ACC_UNPACK(data)
+        # Convert to g (rounding happens in the display formatters)
+        return (x * _ACC_LSB, y * _ACC_LSB, z * _ACC_LSB)
 
     def read_magnetometer_calibrated(self):
         """Read real magnetometer data (mG)"""
         if not self.initialized:
             raise RuntimeError("LSM303DLH not initialized")
         
-        with self.lock:
-            try:
-                # Read 6 bytes (X/Y/Z high/low)
-                data = self.bus.read_i2c_block_data(self.mag_addr, MAG_OUT_X_H_M, 6)
-                
-                # Convert to raw values
-                x = (data[0] << 8) | data[1]
-                y = (data[2] << 8) | data[3]
-                z = (data[4] << 8) | data[5]
-                
-                # Convert to signed 16-bit values
-                x = x if x < 32768 else x - 65536
-                y = y if y < 32768 else y - 65536
-                z = z if z < 32768 else z - 65536
-                
-                # Convert to mG (±1.3g range: 1 LSB = 0.061 mG)
-                x_mg = x * 0.061
-                y_mg = y * 0.061
-                z_mg = z * 0.061
-                
-                return (round(x_mg, 1), round(y_mg, 1), round(z_mg, 1))
-            except Exception as e:
-                raise RuntimeError(f"Failed to read magnetometer: {str(e)}")
+        try:
+            # Read 6 bytes (X/Y/Z high/low) - register write + read in one transaction
+            self.bus.i2c_rdwr(*self._mag_msgs)
+            return self._convert_mag(self._mag_buf)
+        except Exception as e:
+            raise RuntimeError(f"Failed to read magnetometer: {str(e)}")
+
+    def _convert_mag(self, data):
+        """Big-endian X/Y/Z bytes -> mG"""
+        # Mag registers are H,L order -> big-endian struct
+        x, y, z = _MAG_UNPACK(data)
+        # Convert to mG (rounding happens in the display formatters)
+        return (x * _MAG_LSB, y * _MAG_LSB, z * _MAG_LSB)
+
+    def read_all(self):
+        """Read accel + mag in ONE i2c_rdwr call (4 messages, repeated START, one ioctl)"""
+        if not self.initialized:
+            raise RuntimeError("LSM303DLH not initialized")
+
+        try:
+            if ACCEL_FIFO:
+                accel = self._read_accel_fifo()
+                self.bus.i2c_rdwr(*self._mag_msgs)
+                return accel, self._convert_mag(self._mag_buf)
+            self.bus.i2c_rdwr(*self._all_msgs)
+            return self._convert_accel(self._acc_buf), self._convert_mag(self._mag_buf)
+        except Exception as e:
+            raise RuntimeError(f"Failed to read sensor: {str(e)}")
+
+    def _read_accel_fifo(self):
+        """Drain the accel FIFO in one burst (up to 32 x 6 bytes) -> mean (x, y, z) in g"""
+        src = self.bus.read_byte_data(self.accel_addr, ACCEL_FIFO_SRC_REG_A)
+        count = ACCEL_FIFO_DEPTH if src & 0x40 else src & 0x1F  # OVRN -> FIFO full
+        if count == 0:
+            # Nothing new buffered - fall back to the output registers
+            self.bus.i2c_rdwr(*self._acc_msgs)
+            return self._convert_accel(self._acc_buf)
+        r = self._msg.read(self.accel_addr, 6 * count)
+        # Auto-increment wraps OUT_X_L..OUT_Z_H, popping one FIFO sample per 6 bytes
+        self.bus.i2c_rdwr(self._msg.write(self.accel_addr, [ACCEL_OUT_X_L_A | 0x80]), r)
+        mean = np.frombuffer(bytes(r), dtype="<i2").reshape(-1, 3).mean(axis=0) * _ACC_LSB
+        return (float(mean[0]), float(mean[1]), float(mean[2]))
+
+    def read_accel_batch(self, n):
+        """Read n accelerometer samples in one i2c_rdwr call -> (n, 3) array in g.
+
+        For high-rate polling (chip ODR up to 400Hz); scaling is one vectorized multiply.
+        """
+        if not self.initialized:
+            raise RuntimeError("LSM303DLH not initialized")
+
+        try:
+            reads = [self._msg.read(self.accel_addr, 6) for _ in range(n)]
+            msgs = []
+            for r in reads:
+                msgs.append(self._msg.write(self.accel_addr, [ACCEL_OUT_X_L_A | 0x80]))
+                msgs.append(r)
+            self.bus.i2c_rdwr(*msgs)
+            raw = np.frombuffer(b"".join(bytes(r) for r in reads), dtype="<i2")
+            return raw.reshape(-1, 3) * _ACC_LSB
+        except Exception as e:
+            raise RuntimeError(f"Failed to read accelerometer batch: {str(e)}")
 
     def close(self):
         """Close I2C bus (safe shutdown)"""
@@ -132,7 +225,6 @@ class LSM303DLH:
 # Real Sensor Thread (NO DUMMY DATA)
 # ==============================================
 class SensorThread(QThread):
-    data_signal = pyqtSignal(tuple, tuple)  # (accel_data, mag_data)
     status_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
 
@@ -141,13 +233,25 @@ class SensorThread(QThread):
         self.i2c_bus = i2c_bus
         self.running = False
         self.lock = Lock()
+        self._stop_evt = Event()  # Set by stop_sensor() -> loop exits without finishing a sleep
+        self._stopped = True      # stop_sensor() already ran (makes repeat calls free)
         self.sensor = None
+        # Latest sample, SoA: [ax, ay, az, mx, my, mz] written in place (SPSC seqlock).
+        # Producer (run) bumps seq to odd, writes, bumps to even; GUI timer reads seq twice.
+        self.samples = array("d", [0.0] * 6)
+        self.seq = 0
+        self._last_accel = self._last_mag = None  # Last published sample
 
     def run(self):
         """Main sensor thread (REAL DATA ONLY)"""
         # Initialize real sensor (no fallback)
         try:
             self.sensor = LSM303DLH(i2c_bus=self.i2c_bus)
+            if not self.sensor._available:
+                # No I2C stack on this host - report disabled instead of a hard error
+                self.status_signal.emit("Sensor: disabled (smbus2 not installed)")
+                self.running = False
+                return
             self.sensor.initialize()
             self.status_signal.emit("LSM303DLH initialized - reading real data")
         except Exception as e:
@@ -156,25 +260,46 @@ class SensorThread(QThread):
             return
 
         # Read real sensor data (10Hz)
+        backoff = REINIT_BACKOFF_MIN
+        self._state = "ok"
         while self.running:
             try:
-                accel_data = self.sensor.read_accelerometer()
-                mag_data = self.sensor.read_magnetometer_calibrated()
-                self.data_signal.emit(accel_data, mag_data)
-                self.status_signal.emit(f"Active - Accel: {accel_data} | Mag: {mag_data}")
-                time.sleep(0.1)  # 10Hz update rate (Pi 5 optimized)
+                accel_data, mag_data = self.sensor.read_all()
+                # Publish only when the displayed value could change (idle GUI ticks otherwise)
+                if (self._last_accel is None
+                        or _moved(accel_data, self._last_accel, ACCEL_DISPLAY_STEP)
+                        or _moved(mag_data, self._last_mag, MAG_DISPLAY_STEP)):
+                    self._last_accel, self._last_mag = accel_data, mag_data
+                    self.seq += 1  # Odd: write in progress
+                    samples = self.samples
+                    samples[0], samples[1], samples[2] = accel_data
+                    samples[3], samples[4], samples[5] = mag_data
+                    self.seq += 1  # Even: sample complete
+                if self._state != "ok":
+                    self._set_state("ok", "Sensor recovered - reading real data")
+                    backoff = REINIT_BACKOFF_MIN
+                self._stop_evt.wait(0.1)  # 10Hz update rate (Pi 5 optimized)
             except Exception as e:
-                error_msg = f"Real sensor read error: {str(e)}"
-                self.error_signal.emit(error_msg)
-                self.status_signal.emit(error_msg)
-                time.sleep(1)
-                # Re-initialize on error (real hardware recovery)
-                try:
-                    self.sensor.initialize()
-                except:
-                    self.error_signal.emit("Failed to re-initialize sensor - stopping")
-                    self.running = False
-                    break
+                if self._state == "ok":
+                    self._set_state("degraded", f"Real sensor read error: {str(e)} - retrying")
+                # Re-initialize on error with exponential backoff (no I2C bus storm)
+                while self.running:
+                    if self._stop_evt.wait(backoff):
+                        break
+                    try:
+                        self.sensor.initialize()
+                        break
+                    except Exception:
+                        if backoff >= REINIT_BACKOFF_MAX:
+                            self._set_state("failed", "Failed to re-initialize sensor - stopping")
+                            self.error_signal.emit("Failed to re-initialize sensor - stopping")
+                            self.running = False
+                        backoff = min(backoff * 2, REINIT_BACKOFF_MAX)
+
+    def _set_state(self, state, msg):
+        """ok / degraded / failed - status is emitted on transitions only (no per-tick spam)"""
+        self._state = state
+        self.status_signal.emit(msg)
 
     def start_sensor(self):
         """Start real sensor thread (no dummy)"""
@@ -183,19 +308,27 @@ class SensorThread(QThread):
                 self.status_signal.emit("Sensor already running (real data only)")
                 return
             self.running = True
+            self._stopped = False
+            self._stop_evt.clear()
+            self._last_accel = self._last_mag = None  # Fresh start always publishes
         if not self.isRunning():
             self.start()
 
     def stop_sensor(self):
-        """Stop real sensor thread"""
+        """Stop real sensor thread (idempotent - close/error paths may both call it)"""
         with self.lock:
+            if self._stopped:
+                return
+            self._stopped = True
             self.running = False
+        self._stop_evt.set()  # Interrupt the 0.1s / backoff wait immediately
+        self.wait(2000)  # Timeout to prevent hanging
+        # Close only after the reader has exited (reads are lock-free)
         if self.sensor:
             try:
                 self.sensor.close()
             except:
                 pass
-        self.wait(2000)  # Timeout to prevent hanging
 
 # ==============================================
 # Sensor Widget (REAL DATA ONLY | NO BME)
@@ -207,12 +340,18 @@ class SensorWidget(QWidget):
         self.sensor_thread = SensorThread(i2c_bus=1)
         
         # Connect signals (real data only)
-        self.sensor_thread.data_signal.connect(self.update_sensor_data)
         self.sensor_thread.status_signal.connect(self.update_status)
         self.sensor_thread.error_signal.connect(self.show_error)
+        self.sensor_thread.finished.connect(self._on_thread_finished)
         
         # Initialize UI
         self._setup_ui()
+
+        # GUI-side drain of the latest sample (10Hz, only while the sensor runs)
+        self._drain_timer = QTimer(self)
+        self._drain_timer.setInterval(SENSOR_UI_MS)
+        self._drain_timer.timeout.connect(self._drain_latest)
+        self._seen_seq = 0
         
         # Default values (no dummy data)
         self.accel_x = 0.0
@@ -258,20 +397,11 @@ class SensorWidget(QWidget):
         accel_group = QGroupBox("Accelerometer (g) - REAL DATA")
         accel_layout = QGridLayout(accel_group)
         
-        self.accel_x_label = QLabel("X: --")
-        self.accel_y_label = QLabel("Y: --")
-        self.accel_z_label = QLabel("Z: --")
-        
-        for lbl in [self.accel_x_label, self.accel_y_label, self.accel_z_label]:
-            lbl.setFont(QFont("Arial", 12, QFont.Bold))
-            lbl.setAlignment(Qt.AlignCenter)
-        
-        accel_layout.addWidget(QLabel("X Axis:"), 0, 0)
-        accel_layout.addWidget(self.accel_x_label, 0, 1)
-        accel_layout.addWidget(QLabel("Y Axis:"), 1, 0)
-        accel_layout.addWidget(self.accel_y_label, 1, 1)
-        accel_layout.addWidget(QLabel("Z Axis:"), 2, 0)
-        accel_layout.addWidget(self.accel_z_label, 2, 1)
+        # One label for all three axes (one setText/repaint per tick instead of three)
+        self.accel_label = QLabel(_AXES_IDLE)
+        self.accel_label.setFont(QFont("Arial", 12, QFont.Bold))
+        self.accel_label.setAlignment(Qt.AlignCenter)
+        accel_layout.addWidget(self.accel_label, 0, 0)
         
         data_grid.addWidget(accel_group, 0, 0)
 
@@ -279,20 +409,10 @@ class SensorWidget(QWidget):
         mag_group = QGroupBox("Magnetometer (mG) - REAL DATA")
         mag_layout = QGridLayout(mag_group)
         
-        self.mag_x_label = QLabel("X: --")
-        self.mag_y_label = QLabel("Y: --")
-        self.mag_z_label = QLabel("Z: --")
-        
-        for lbl in [self.mag_x_label, self.mag_y_label, self.mag_z_label]:
-            lbl.setFont(QFont("Arial", 12, QFont.Bold))
-            lbl.setAlignment(Qt.AlignCenter)
-        
-        mag_layout.addWidget(QLabel("X Axis:"), 0, 0)
-        mag_layout.addWidget(self.mag_x_label, 0, 1)
-        mag_layout.addWidget(QLabel("Y Axis:"), 1, 0)
-        mag_layout.addWidget(self.mag_y_label, 1, 1)
-        mag_layout.addWidget(QLabel("Z Axis:"), 2, 0)
-        mag_layout.addWidget(self.mag_z_label, 2, 1)
+        self.mag_label = QLabel(_AXES_IDLE)
+        self.mag_label.setFont(QFont("Arial", 12, QFont.Bold))
+        self.mag_label.setAlignment(Qt.AlignCenter)
+        mag_layout.addWidget(self.mag_label, 0, 0)
         
         data_grid.addWidget(mag_group, 0, 1)
 
@@ -308,31 +428,43 @@ class SensorWidget(QWidget):
         """Toggle real sensor (no dummy)"""
         if not self.sensor_thread.running:
             self.activate_btn.setText("Deactivate Real LSM303DLH Sensor")
+            self._seen_seq = self.sensor_thread.seq  # Ignore a sample left from a previous run
             self.sensor_thread.start_sensor()
+            self._drain_timer.start()
         else:
             self.activate_btn.setText("Activate Real LSM303DLH Sensor")
+            self._drain_timer.stop()
             self.sensor_thread.stop_sensor()
             # Reset labels (no dummy data)
-            self.accel_x_label.setText("X: --")
-            self.accel_y_label.setText("Y: --")
-            self.accel_z_label.setText("Z: --")
-            self.mag_x_label.setText("X: --")
-            self.mag_y_label.setText("Y: --")
-            self.mag_z_label.setText("Z: --")
+            self.accel_label.setText(_AXES_IDLE)
+            self.mag_label.setText(_AXES_IDLE)
             self.status_label.setText("Status: Sensor disabled (REAL ONLY - no dummy data)")
 
+    def _on_thread_finished(self):
+        """Reset the button if the thread exited on its own (e.g. sensor disabled)"""
+        if not self.sensor_thread.running:
+            self._drain_timer.stop()
+            self.activate_btn.setText("Activate Real LSM303DLH Sensor")
+
+    def _drain_latest(self):
+        """Show the newest sample only (seqlock read of the shared sample array)"""
+        thread = self.sensor_thread
+        seq = thread.seq
+        if seq == self._seen_seq or seq & 1:
+            return  # Nothing new, or a write is in progress (next tick picks it up)
+        ax, ay, az, mx, my, mz = thread.samples
+        if thread.seq != seq:
+            return  # Torn read - retry on the next tick
+        self._seen_seq = seq
+        self.update_sensor_data((ax, ay, az), (mx, my, mz))
+
     def update_sensor_data(self, accel_data, mag_data):
         """Update real sensor data labels"""
         self.accel_x, self.accel_y, self.accel_z = accel_data
         self.mag_x, self.mag_y, self.mag_z = mag_data
         
-        self.accel_x_label.setText(f"X: {self.accel_x:.2f}")
-        self.accel_y_label.setText(f"Y: {self.accel_y:.2f}")
-        self.accel_z_label.setText(f"Z: {self.accel_z:.2f}")
-        
-        self.mag_x_label.setText(f"X: {self.mag_x:.1f}")
-        self.mag_y_label.setText(f"Y: {self.mag_y:.1f}")
-        self.mag_z_label.setText(f"Z: {self.mag_z:.1f}")
+        self.accel_label.setText(f"X: {self.accel_x:.2f}\nY: {self.accel_y:.2f}\nZ: {self.accel_z:.2f}")
+        self.mag_label.setText(f"X: {self.mag_x:.1f}\nY: {self.mag_y:.1f}\nZ: {self.mag_z:.1f}")
 
     def update_status(self, msg):
         """Update status label (real data only)"""
@@ -344,14 +476,15 @@ class SensorWidget(QWidget):
                             f"{msg}\n\nNo dummy data available - connect LSM303DLH to I2C Bus 1 and try again.", 
                             QMessageBox.Ok)
         # Stop sensor on critical error
+        self._drain_timer.stop()
         self.sensor_thread.stop_sensor()
         self.activate_btn.setText("Activate Real LSM303DLH Sensor")
         self.status_label.setText(f"Status: ERROR - {msg[:50]}...")
 
     def close(self):
         """Cleanup real sensor"""
-        if self.sensor_thread.running:
-            self.sensor_thread.stop_sensor()
+        self._drain_timer.stop()
+        self.sensor_thread.stop_sensor()  # No-op if already stopped
         super().close()
 
 # ==============================================
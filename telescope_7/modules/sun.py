@@ -1,4 +1,5 @@
 import ephem
+import math
 import datetime
 from threading import Lock
 from PyQt5.QtWidgets import (
@@ -8,6 +9,10 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer
 
+_RAD2DEG = 180.0 / math.pi
+RISE_SET_PRESSURE = 1010.0  # mBar - ephem's default (refraction-correct rise/set)
+SUNRISE_LOCATION_TOLERANCE = 0.01  # ° - smaller moves keep the shown sunrise/sunset
+
 # Solar tracking thread (Pi 5 / 800×480 Optimized)
 class SunTrackingThread(QThread):
     position_signal = pyqtSignal(float, float)
@@ -24,12 +29,37 @@ class SunTrackingThread(QThread):
         self.auto_track = False
         self.update_interval = 2  # 2s update (Pi 5 responsive)
 
+        # One reused observer for position and rise/set (only date/pressure/location change)
+        self._observer = ephem.Observer()
+        self._observer.pressure = 0  # Disable refraction (faster calculation)
+        self._sun = ephem.Sun()
+        self._apply_location()
+
+        # Sunrise/sunset memo: (lat, lon, day) -> (sunrise_str, sunset_str)
+        self._sunrise_cache = {}
+        self._rs_location = (None, None, None)  # (lat, lon, day) of the shown rise/set
+        self._midnight_timer = QTimer()  # Daily refresh (lives in the GUI thread)
+        self._midnight_timer.setSingleShot(True)
+        self._midnight_timer.timeout.connect(self.calculate_sunrise_sunset)
+
+    def _apply_location(self):
+        """Push lat/lon into the cached observer (parsed once, not per tick)"""
+        self._observer.lat = math.radians(self.lat)  # Float = radians (no string parsing)
+        self._observer.lon = math.radians(self.lon)
+
     def set_location(self, lat, lon):
         """Thread-safe location update (decimal precision)"""
         with self.lock:
             self.lat = float(lat)
             self.lon = float(lon)
+            self._apply_location()
         self.status_signal.emit(f"📍 Location: {lat:.2f}° N, {lon:.2f}° E")
+        # Rise/set shifts by seconds for sub-0.01° moves - only re-solve on a real change
+        rs_lat, rs_lon, rs_day = self._rs_location
+        if (rs_day == datetime.date.today()
+                and abs(self.lat - rs_lat) < SUNRISE_LOCATION_TOLERANCE
+                and abs(self.lon - rs_lon) < SUNRISE_LOCATION_TOLERANCE):
+            return
         self.calculate_sunrise_sunset()  # Update sunrise/sunset with new location
 
     def set_auto_track(self, enable):
@@ -42,16 +72,12 @@ class SunTrackingThread(QThread):
     def calculate_sun_position(self):
         """Pi 5 optimized sun position calculation (safety critical)"""
         try:
-            observer = ephem.Observer()
-            observer.lat = str(self.lat)
-            observer.lon = str(self.lon)
-            observer.date = ephem.now()  # Faster than datetime (ephem native)
-            observer.pressure = 0  # Disable refraction (faster calculation)
-            sun = ephem.Sun(observer)
-            
-            # Convert radians to degrees
-            alt = float(sun.alt) * 180.0 / ephem.pi
-            az = float(sun.az) * 180.0 / ephem.pi
+            with self.lock:
+                self._observer.date = ephem.now()  # Faster than datetime (ephem native)
+                self._sun.compute(self._observer)
+                # Convert radians to degrees
+                alt = float(self._sun.alt) * _RAD2DEG
+                az = float(self._sun.az) * _RAD2DEG
             return alt, az
         except Exception as e:
             self.error_signal.emit(f"Calc Error: {str(e)[:25]}...")
@@ -60,19 +86,30 @@ class SunTrackingThread(QThread):
     def calculate_sunrise_sunset(self):
         """Calculate sunrise/sunset times (Pi 5 optimized)"""
         try:
-            observer = ephem.Observer()
-            observer.lat = str(self.lat)
-            observer.lon = str(self.lon)
-            observer.date = ephem.now()
-            
-            # Calculate sunrise/sunset
-            sunrise = ephem.localtime(observer.next_rising(ephem.Sun()))
-            sunset = ephem.localtime(observer.next_setting(ephem.Sun()))
-            
-            # Format times (ultra-compact for 800×480)
-            sunrise_str = sunrise.strftime("%H:%M")
-            sunset_str = sunset.strftime("%H:%M")
-            
+            today = datetime.date.today()
+            with self.lock:
+                key = (round(self.lat, 3), round(self.lon, 3), today.toordinal())
+                cached = self._sunrise_cache.get(key)
+                if cached is None:
+                    observer = self._observer
+                    observer.date = ephem.now()
+                    # Calculate sunrise/sunset (standard refraction, then back to the fast path)
+                    observer.pressure = RISE_SET_PRESSURE
+                    try:
+                        sunrise = ephem.localtime(observer.next_rising(self._sun))
+                        sunset = ephem.localtime(observer.next_setting(self._sun))
+                    finally:
+                        observer.pressure = 0
+                    # Format times (ultra-compact for 800×480)
+                    cached = (sunrise.strftime("%H:%M"), sunset.strftime("%H:%M"))
+                    self._sunrise_cache = {key: cached}  # Only the current day/location is kept
+            sunrise_str, sunset_str = cached
+            self._rs_location = (self.lat, self.lon, today)
+
+            # Refresh once just after local midnight
+            midnight = datetime.datetime.combine(today + datetime.timedelta(days=1), datetime.time())
+            self._midnight_timer.start(int((midnight - datetime.datetime.now()).total_seconds() * 1000) + 1000)
+
             self.sunrise_sunset_signal.emit(sunrise_str, sunset_str)
             self.status_signal.emit(f"🌅 {sunrise_str} | 🌇 {sunset_str}")
         except Exception as e:
@@ -94,6 +131,7 @@ class SunTrackingThread(QThread):
 
     def stop(self):
         """Graceful thread shutdown"""
+        self._midnight_timer.stop()
         with self.lock:
             self.running = False
         self.wait()
@@ -344,9 +382,7 @@ class SunTrackingWidget(QWidget):
         self.lon = self.lon_spin.value()
         self.tracking_thread.set_location(self.lat, self.lon)
         self.lat_lon_updated.emit(self.lat, self.lon)
-        # Update sunrise/sunset with new location
-        self.tracking_thread.calculate_sunrise_sunset()
-        # Compact message box
+        # Compact message box (set_location already refreshed sunrise/sunset)
         QMessageBox.information(self, "Location Updated", 
                                f"Lat: {self.lat:.4f}°\nLon: {self.lon:.4f}°")
 
@@ -1,10 +1,16 @@
 import cv2
+import numpy as np
 import os
-import time
+import queue
 import datetime
+import time
 import requests
-import base64
-from threading import Lock, Thread
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import binascii
+import json
+from threading import Event, Lock, Thread
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
     QLabel, QGroupBox, QFrame, QSlider, QMessageBox, QTextEdit
@@ -12,39 +18,147 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import QThread, pyqtSignal, Qt
 from PyQt5.QtGui import QImage, QPixmap
 
+# One OpenCV worker: capture, saver, AI and UI threads already share the Pi 5's 4 cores
+cv2.setNumThreads(1)
+
+# Hardware H.264 recording pipeline (needs OpenCV built with GStreamer + a V4L2 M2M encoder).
+# Opt-in via camera.h264_pipeline: the Pi 5 has no hardware H.264 encoder, so mp4v is the default.
+H264_PIPELINE = (
+    "appsrc ! videoconvert ! v4l2h264enc ! h264parse ! mp4mux ! filesink location={path}"
+)
+
+# Live preview size (small feed for the 800×480 screen)
+PREVIEW_SIZE = (320, 240)
+
+# Qt >= 5.14 takes OpenCV's BGR bytes directly; older Qt needs a BGR → RGB pass
+_BGR888 = getattr(QImage, "Format_BGR888", None)
+PREVIEW_FORMAT = _BGR888 if _BGR888 is not None else QImage.Format_RGB888
+_PREVIEW_TO_GRAY = cv2.COLOR_BGR2GRAY if _BGR888 is not None else cv2.COLOR_RGB2GRAY
+
+# Focus score (variance of Laplacian on the preview) every N shown frames
+FOCUS_EVERY = 10
+
+# Max wait at exit for the saver thread to write queued captures (4 full-res JPEGs fit easily)
+SAVER_JOIN_TIMEOUT_S = 5.0
+
+try:
+    from numba import njit  # Optional: compiled focus kernel (same pattern as motor_step)
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _focus_kernel(gray):
+        """Variance of the 4-neighbour Laplacian over the interior pixels (one pass)"""
+        h, w = gray.shape
+        total = 0.0
+        total_sq = 0.0
+        for i in range(1, h - 1):
+            for j in range(1, w - 1):
+                lap = (float(gray[i - 1, j]) + float(gray[i + 1, j]) + float(gray[i, j - 1])
+                       + float(gray[i, j + 1]) - 4.0 * float(gray[i, j]))
+                total += lap
+                total_sq += lap * lap
+        n = (h - 2) * (w - 2)
+        mean = total / n
+        return total_sq / n - mean * mean
+
+    def focus_score(gray):
+        """Focus score of a grey preview (higher = sharper)"""
+        return float(_focus_kernel(gray))
+else:
+    def focus_score(gray):
+        """Focus score of a grey preview (higher = sharper) - OpenCV C kernel without numba"""
+        return float(cv2.Laplacian(gray, cv2.CV_32F).var())
+
+# Placeholder spliced out of the serialized payload (base64 bytes are inserted once, never copied into a str)
+_IMAGE_MARKER = "@@IMAGE@@"
+
+# Upload copy for AI analysis (the model gains nothing above ~1024px on the long edge)
+AI_MAX_EDGE = 1024
+AI_JPEG_QUALITY = 80
+AI_MAX_INFLIGHT = 4  # Concurrent analyses (matches the session's connection pool)
+AI_STOP_TIMEOUT_MS = 2000  # Never hold up window close on a slow analysis
+_AI_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, AI_JPEG_QUALITY,
+                   cv2.IMWRITE_JPEG_PROGRESSIVE, 1, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+
+def _ai_jpeg(frame):
+    """Downscaled, lower-quality JPEG for the DeepSeek upload (also the default disk copy)"""
+    h, w = frame.shape[:2]
+    scale = AI_MAX_EDGE / max(h, w)
+    if scale < 1.0:
+        frame = cv2.resize(frame, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+    ok, buf = cv2.imencode(".jpg", frame, _AI_JPEG_PARAMS)
+    if not ok:
+        raise Exception("AI JPEG encode failed")
+    return buf
+
 # --------------------------
 # AI Image Analysis Thread (Non-blocking)
 # --------------------------
-class DeepSeekAnalysisThread(Thread):
-    """Separate thread for DeepSeek API calls (avoids UI freezing)"""
-    def __init__(self, image_path, result_callback, error_callback, api_key):
+class DeepSeekAnalysisThread(QThread):
+    """Long-lived worker for DeepSeek image analysis (avoids UI freezing)"""
+    result_signal = pyqtSignal(str)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, api_key):
         super().__init__()
-        self.image_path = image_path
-        self.result_callback = result_callback
-        self.error_callback = error_callback
         self.api_key = api_key
-        self.daemon = True  # Thread exits when main app closes
+        self.request_queue = queue.Queue()  # JPEG bytes per capture; None = shutdown
+
+        # One keep-alive session for every analysis (TLS handshake paid once, bursts share the pool)
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=AI_MAX_INFLIGHT,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],  # Transient only; a 500 is reported, not resent
+                allowed_methods=("POST",),  # Analysis request is safe to resend
+                raise_on_status=False  # Last error response reaches raise_for_status() -> HTTPError message
+            )
+        ))
+
+    def analyze(self, image_bytes):
+        """Queue a captured JPEG for analysis"""
+        self.request_queue.put(image_bytes)
 
-    def _encode_image_to_base64(self):
-        """Convert image to base64 (required for DeepSeek API)"""
+    def run(self):
+        # Burst captures overlap on the session pool instead of queueing behind each other
+        pool = ThreadPoolExecutor(max_workers=AI_MAX_INFLIGHT)
+        while True:
+            image_bytes = self.request_queue.get()
+            if image_bytes is None:  # Shutdown sentinel from stop()
+                break
+            pool.submit(self._analyze, image_bytes)
+        # Drop queued analyses; in-flight posts finish on their own (bounded by the request timeout)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self):
+        self.request_queue.put_nowait(None)  # Wake run() immediately
+        self.wait(AI_STOP_TIMEOUT_MS)
+        self._session.close()
+
+    def _encode_image_to_base64(self, image_bytes):
+        """Convert image to base64 bytes (required for DeepSeek API) - in memory, no disk read"""
         try:
-            with open(self.image_path, "rb") as image_file:
-                return base64.b64encode(image_file.read()).decode("utf-8")
+            return binascii.b2a_base64(image_bytes, newline=False)
         except Exception as e:
             raise Exception(f"Encode error: {str(e)}")
 
-    def run(self):
-        """Execute DeepSeek API call"""
+    def _analyze(self, image_bytes):
+        """Execute one DeepSeek API call (pool worker)"""
         # Validate API key
         if not self.api_key or self.api_key.strip() == "":
-            self.error_callback("❌ DeepSeek API key missing!\nAdd to config/settings.json")
+            self.error_signal.emit("❌ DeepSeek API key missing!\nAdd to config/settings.json")
             return
 
         # Encode image to base64
         try:
-            base64_image = self._encode_image_to_base64()
+            base64_image = self._encode_image_to_base64(image_bytes)
         except Exception as e:
-            self.error_callback(f"❌ Image encode failed: {str(e)}")
+            self.error_signal.emit(f"❌ Image encode failed: {str(e)}")
             return
 
         # Prepare API request
@@ -70,7 +184,7 @@ Keep it short (2-3 sentences max)."""
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/jpeg;base64,{base64_image}"
+                            "url": f"data:image/jpeg;base64,{_IMAGE_MARKER}"
                         }
                     }
                 ]
@@ -84,25 +198,29 @@ Keep it short (2-3 sentences max)."""
             "max_tokens": 300  # Shorter results for small screen
         }
 
+        # Serialize the small JSON envelope, then splice the base64 bytes in (alphabet needs no JSON escaping)
+        head, tail = json.dumps(payload).encode("utf-8").split(_IMAGE_MARKER.encode("ascii"))
+        body = b"".join((head, base64_image, tail))
+
         # Send request to DeepSeek API
         try:
-            response = requests.post("https://api.deepseek.com/v1/chat/completions", 
-                                    json=payload, headers=headers, timeout=30)
+            response = self._session.post("https://api.deepseek.com/v1/chat/completions",
+                                          data=body, headers=headers, timeout=(5, 30))
             response.raise_for_status()
             result = response.json()
             
             # Extract analysis text
             analysis = result["choices"][0]["message"]["content"].strip()
-            self.result_callback(analysis)
+            self.result_signal.emit(analysis)
 
         except requests.exceptions.Timeout:
-            self.error_callback("❌ API timeout (check internet)")
+            self.error_signal.emit("❌ API timeout (check internet)")
         except requests.exceptions.ConnectionError:
-            self.error_callback("❌ API connection failed (check internet)")
+            self.error_signal.emit("❌ API connection failed (check internet)")
         except requests.exceptions.HTTPError as e:
-            self.error_callback(f"❌ API error: {str(e)} (invalid key?)")
+            self.error_signal.emit(f"❌ API error: {str(e)} (invalid key?)")
         except Exception as e:
-            self.error_callback(f"❌ AI failed: {str(e)}")
+            self.error_signal.emit(f"❌ AI failed: {str(e)}")
 
 # --------------------------
 # Camera Thread (Pi 5 800×480 Optimized)
@@ -112,12 +230,16 @@ class CameraThread(QThread):
     status_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
     save_signal = pyqtSignal(str)
+    jpeg_signal = pyqtSignal(str, bytes)  # (filepath, AI-sized JPEG) - feeds AI without a disk re-read
+    metric_signal = pyqtSignal(float)  # Focus score (higher = sharper)
 
     def __init__(self, config):
         super().__init__()
-        self.running = False
-        self.recording = False
-        self.lock = Lock()
+        # Run/record/capture flags are Events (lock-free checks in the capture loop)
+        self.running_ev = Event()
+        self.recording_ev = Event()
+        self.save_ev = Event()
+        self.cap_lock = Lock()  # Only guards cap.set (V4L2 ioctls can block for a frame)
         
         # Camera config (800×480 optimized)
         self.config = config
@@ -126,6 +248,10 @@ class CameraThread(QThread):
         self.exposure = config["camera"]["exposure"]
         self.image_path = config["camera"]["image_save_path"]
         self.video_path = config["camera"]["video_save_path"]
+        # Full-resolution 95% archive copy on disk (off: only the AI-sized JPEG is written)
+        self.save_full_res = config["camera"].get("save_full_res", False)
+        # GStreamer H.264 writer (off by default; disabled for the session after a failed open)
+        self.use_h264 = config["camera"].get("h264_pipeline", False)
         
         # Create save directories
         os.makedirs(self.image_path, exist_ok=True)
@@ -135,7 +261,30 @@ class CameraThread(QThread):
         self.cap = None
         self.video_writer = None
         self.frame_count = 0
-        self.save_frame = False
+
+        # Double-buffered preview frames (resize/convert in place, no per-frame allocation)
+        w, h = PREVIEW_SIZE
+        self._preview_bufs = [np.empty((h, w, 3), np.uint8) for _ in range(2)]
+        self._idx = 0
+        self._preview_frame = None  # Keeps the last buffer alive while Qt renders it
+        self._ui_ready = True  # Cleared on emit, set again by the widget's frame_ack
+        self._preview_count = 0
+        self._gray = np.empty((h, w), np.uint8)
+
+        # JPEG encode + disk write run on a saver thread (capture loop never blocks on I/O)
+        self.save_queue = queue.Queue(maxsize=4)
+        self._saver = Thread(target=self._save_worker, daemon=True)
+        self._saver.start()
+
+    @property
+    def running(self):
+        """Camera loop active (read-only view of running_ev)"""
+        return self.running_ev.is_set()
+
+    @property
+    def recording(self):
+        """Video recording active (read-only view of recording_ev)"""
+        return self.recording_ev.is_set()
 
     def _init_camera(self):
         """Initialize Pi 5 camera (V4L2 backend)"""
@@ -166,17 +315,16 @@ class CameraThread(QThread):
 
     def start_camera(self):
         """Start camera (thread-safe)"""
-        with self.lock:
-            self.running = True
+        self.running_ev.set()
+        self._ui_ready = True
         if not self.isRunning():
             self.start()
         self.status_signal.emit("📹 Camera started")
 
     def stop_camera(self):
         """Stop camera and release resources"""
-        with self.lock:
-            self.running = False
-            self.recording = False
+        self.running_ev.clear()
+        self.recording_ev.clear()
         if self.cap:
             self.cap.release()
         if self.video_writer:
@@ -185,28 +333,50 @@ class CameraThread(QThread):
         self.wait()
         self.status_signal.emit("🛑 Camera stopped")
 
+    def shutdown(self):
+        """Stop the camera and flush pending captures (app exit only - the saver is not restarted)"""
+        if self.running:
+            self.stop_camera()
+        self.save_queue.put(None)  # Saver exits after writing everything queued before it
+        self._saver.join(SAVER_JOIN_TIMEOUT_S)
+
     def toggle_recording(self):
         """Toggle video recording"""
-        with self.lock:
-            self.recording = not self.recording
-        
-        if self.recording:
+        if not self.recording_ev.is_set():
             # Start recording (MP4 format)
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             video_filename = f"video_{timestamp}.mp4"
             video_path = os.path.join(self.video_path, video_filename)
             
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            self.video_writer = cv2.VideoWriter(
-                video_path,
-                fourcc,
-                self.fps,
-                self.resolution
-            )
+            # Hardware H.264 (V4L2 M2M) via GStreamer when enabled; software mp4v otherwise
+            self.video_writer = None
+            encoder = "H.264"
+            if self.use_h264:
+                self.video_writer = cv2.VideoWriter(
+                    H264_PIPELINE.format(path=video_path),
+                    cv2.CAP_GSTREAMER,
+                    0,
+                    self.fps,
+                    self.resolution
+                )
+                if not self.video_writer.isOpened():
+                    self.use_h264 = False  # Encoder missing - don't retry on every recording
+                    self.video_writer = None
+            if self.video_writer is None:
+                fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+                self.video_writer = cv2.VideoWriter(
+                    video_path,
+                    fourcc,
+                    self.fps,
+                    self.resolution
+                )
+                encoder = "mp4v"
+            self.recording_ev.set()
             
-            self.status_signal.emit(f"🎥 Recording: {video_filename}")
+            self.status_signal.emit(f"🎥 Recording ({encoder}): {video_filename}")
         else:
             # Stop recording
+            self.recording_ev.clear()
             if self.video_writer:
                 self.video_writer.release()
                 self.video_writer = None
@@ -214,14 +384,13 @@ class CameraThread(QThread):
 
     def capture_image(self):
         """Capture still image (thread-safe)"""
-        with self.lock:
-            self.save_frame = True
+        self.save_ev.set()
         self.status_signal.emit("📸 Capture requested")
 
     def set_exposure(self, exposure):
         """Update exposure value"""
-        with self.lock:
-            self.exposure = exposure
+        self.exposure = exposure
+        with self.cap_lock:
             if self.cap:
                 self.cap.set(cv2.CAP_PROP_EXPOSURE, exposure)
         self.status_signal.emit(f"🔆 Exposure: {exposure}")
@@ -231,52 +400,93 @@ class CameraThread(QThread):
         if not self._init_camera():
             return
         
-        while self.running:
+        frame_budget = 1.0 / self.fps if self.fps else 0.0
+        while self.running_ev.is_set():
+            t0 = time.perf_counter()
             ret, frame = self.cap.read()
             if not ret:
                 self.error_signal.emit("❌ Failed to read frame (check camera)")
                 break
             
-            # Convert BGR → RGB for PyQt (COMPACT size)
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            display_frame = cv2.resize(frame_rgb, (320, 240))  # Small preview for 800×480
-            
-            # Convert to QPixmap
-            h, w, ch = display_frame.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(display_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            pixmap = QPixmap.fromImage(qt_image)
-            
-            # Send frame to UI
-            self.frame_signal.emit(pixmap)
+            # Preview only when the UI has shown the last frame (stale frames are dropped, not queued)
+            if self._ui_ready:
+                # Downscale (colour conversion only on old Qt without Format_BGR888)
+                buf = self._preview_bufs[self._idx]
+                self._idx ^= 1
+                cv2.resize(frame, PREVIEW_SIZE, dst=buf, interpolation=cv2.INTER_NEAREST)  # Cheapest kernel - preview only
+                if _BGR888 is None:
+                    cv2.cvtColor(buf, cv2.COLOR_BGR2RGB, dst=buf)
+                self._preview_frame = buf
+                
+                # Focus telemetry on the small preview (compiled kernel, every Nth frame)
+                self._preview_count += 1
+                if self._preview_count % FOCUS_EVERY == 0:
+                    cv2.cvtColor(buf, _PREVIEW_TO_GRAY, dst=self._gray)
+                    self.metric_signal.emit(focus_score(self._gray))
+                
+                # Convert to QPixmap
+                h, w, ch = buf.shape
+                bytes_per_line = ch * w
+                qt_image = QImage(buf.data, w, h, bytes_per_line, PREVIEW_FORMAT)
+                pixmap = QPixmap.fromImage(qt_image)
+                
+                # Send frame to UI
+                self._ui_ready = False
+                self.frame_signal.emit(pixmap)
             
-            # Save image if requested
-            if self.save_frame:
-                self._save_image(frame)
-                with self.lock:
-                    self.save_frame = False
+            # Save image if requested (handed off - encode/write happen on the saver thread)
+            if self.save_ev.is_set():
+                self.save_ev.clear()
+                try:
+                    self.save_queue.put_nowait((frame.copy(), datetime.datetime.now()))
+                except queue.Full:
+                    self.status_signal.emit("⚠️ Save queue full - capture skipped")
             
             # Record video if active
-            if self.recording and self.video_writer:
-                self.video_writer.write(frame)
+            writer = self.video_writer
+            if self.recording_ev.is_set() and writer:
+                writer.write(frame)
                 self.frame_count += 1
                 if self.frame_count % (self.fps * 5) == 0:
                     self.status_signal.emit(f"📼 Frames: {self.frame_count}")
             
-            # Pi 5 optimization (minimal sleep)
-            time.sleep(0.01)
+            # cap.read() normally paces the loop; only sleep off what is left of the frame budget
+            slack = frame_budget - (time.perf_counter() - t0)
+            if slack > 0:
+                self.msleep(int(slack * 1000))
+
+    def _ack(self):
+        """UI has shown the last frame - next one may be sent"""
+        self._ui_ready = True
+
+    def _save_worker(self):
+        """Saver thread: encode and write queued captures in order"""
+        while True:
+            item = self.save_queue.get()
+            if item is None:
+                break
+            self._save_image(*item)
 
-    def _save_image(self, frame):
+    def _save_image(self, frame, captured_at):
         """Save high-quality image to disk"""
         try:
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = captured_at.strftime("%Y%m%d_%H%M%S")
             filename = f"image_{timestamp}.jpg"
             filepath = os.path.join(self.image_path, filename)
             
-            # Save with 95% JPEG quality
-            cv2.imwrite(filepath, frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+            ai_buf = _ai_jpeg(frame)
+            if self.save_full_res:
+                # Full-quality archive copy on disk (95% JPEG)
+                ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+                if not ok:
+                    raise Exception("JPEG encode failed")
+                buf.tofile(filepath)
+            else:
+                # AI-sized copy doubles as the saved image (5-10× less SD-card writing)
+                ai_buf.tofile(filepath)
             
             self.save_signal.emit(filepath)
+            self.jpeg_signal.emit(filepath, ai_buf.tobytes())
             self.status_signal.emit(f"✅ Saved: {filename}")
         except Exception as e:
             self.error_signal.emit(f"❌ Save error: {str(e)}")
@@ -288,6 +498,7 @@ class WebcamWidget(QWidget):
     # Critical signals (fixed AttributeError)
     analyze_image = pyqtSignal(str)
     status_signal = pyqtSignal(str)
+    frame_ack = pyqtSignal()  # Frame shown - camera thread may send the next
 
     def __init__(self, config):
         super().__init__()
@@ -299,7 +510,15 @@ class WebcamWidget(QWidget):
         self.camera_thread.frame_signal.connect(self.update_frame)
         self.camera_thread.status_signal.connect(self.update_status)
         self.camera_thread.error_signal.connect(self.show_error)
-        self.camera_thread.save_signal.connect(self.on_image_saved)
+        self.camera_thread.jpeg_signal.connect(self.on_image_saved)
+        self.camera_thread.metric_signal.connect(self.update_focus)
+
+        # One AI worker for all captures (shared keep-alive connections)
+        self.ai_thread = DeepSeekAnalysisThread(self.api_key)
+        self.ai_thread.result_signal.connect(self.on_ai_result)
+        self.ai_thread.error_signal.connect(self.on_ai_error)
+        self.ai_thread.start()
+        self.frame_ack.connect(self.camera_thread._ack)
 
         # Initialize UI (COMPACT for 800×480)
         self.init_ui()
@@ -328,6 +547,11 @@ class WebcamWidget(QWidget):
         self.feed_label.setStyleSheet("color: #fff; font-size: 9px;")
         
         feed_layout.addWidget(self.feed_label)
+        
+        self.focus_label = QLabel("Focus: --")
+        self.focus_label.setAlignment(Qt.AlignCenter)
+        self.focus_label.setStyleSheet("color: #fff; font-size: 8px;")
+        feed_layout.addWidget(self.focus_label)
         layout.addWidget(feed_frame, alignment=Qt.AlignCenter)  # Center feed
 
         # 3. CAMERA CONTROLS (COMPACT group)
@@ -487,36 +711,39 @@ class WebcamWidget(QWidget):
 
     def update_frame(self, pixmap):
         """Update camera feed (COMPACT)"""
-        self.feed_label.setPixmap(pixmap.scaled(self.feed_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        self.feed_label.setPixmap(pixmap)  # Already PREVIEW_SIZE (label is fixed 320×240) - no rescale
+        self.frame_ack.emit()
+
+    def update_focus(self, score):
+        """Show focus score from the camera thread"""
+        self.focus_label.setText(f"Focus: {score:.0f}")
 
     # --------------------------
     # AI Analysis Functions (COMPACT)
     # --------------------------
-    def on_image_saved(self, filepath):
+    def on_image_saved(self, filepath, jpeg_bytes):
         """Callback when image is saved - trigger AI analysis"""
         QMessageBox.information(self, "Saved", f"Image saved:\n{os.path.basename(filepath)}\n\nAnalyzing...", QMessageBox.Ok)
         
         # Emit signal for main.py (fixed AttributeError)
         self.analyze_image.emit(filepath)
         
-        # Start AI analysis (COMPACT callbacks)
-        def ai_result_handler(analysis):
-            """Update UI with AI results"""
-            self.ai_results_text.setText(analysis)
-            self.ai_status_label.setText("Status: Analysis complete")
-            self.status_signal.emit("✅ AI analysis done")
-
-        def ai_error_handler(error):
-            """Update UI with AI errors"""
-            self.ai_results_text.setText(f"❌ Error:\n{error}")
-            self.ai_status_label.setText("Status: Analysis failed")
-            self.show_error(error)
-
-        # Launch AI thread
-        ai_thread = DeepSeekAnalysisThread(filepath, ai_result_handler, ai_error_handler, self.api_key)
-        ai_thread.start()
+        # Queue on the shared AI worker (results come back as queued signals on the UI thread)
+        self.ai_thread.analyze(jpeg_bytes)
         self.status_label.setText(f"Status: Analyzing {os.path.basename(filepath)}")
 
+    def on_ai_result(self, analysis):
+        """Update UI with AI results"""
+        self.ai_results_text.setText(analysis)
+        self.ai_status_label.setText("Status: Analysis complete")
+        self.status_signal.emit("✅ AI analysis done")
+
+    def on_ai_error(self, error):
+        """Update UI with AI errors"""
+        self.ai_results_text.setText(f"❌ Error:\n{error}")
+        self.ai_status_label.setText("Status: Analysis failed")
+        self.show_error(error)
+
     # --------------------------
     # Utility Functions (COMPACT)
     # --------------------------
@@ -532,5 +759,5 @@ class WebcamWidget(QWidget):
 
     def close(self):
         """Cleanup on close"""
-        if self.camera_thread.running:
-            self.camera_thread.stop_camera()
\ No newline at end of file
+        self.camera_thread.shutdown()
+        self.ai_thread.stop()
\ No newline at end of file
@@ -1,7 +1,14 @@
+import os
 import sys
 import datetime
+import hashlib
+import importlib.util
 import json
 from pathlib import Path
+try:
+    import orjson  # Faster settings serialization (optional)
+except ImportError:
+    orjson = None
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget,
     QVBoxLayout, QHBoxLayout, QStatusBar, QMessageBox,
@@ -22,6 +29,58 @@ from modules.moon import MoonWidget
 from modules.deepseek import DeepSeekWidget
 from modules import SETTINGS, cleanup_gpio, get_responsive_stylesheet, get_pin_display_name
 
+# Status bar / indicator styles (built once, reused on every update)
+_COLOR_OK = "#00ff00"
+_COLOR_ERR = "#ff4444"
+_COLOR_INFO = "#00a8ff"
+_STYLE_STATUS = "padding: 1px 5px; font-size: 8px;"
+_STATUS_TMPL = (
+    '<span style="color:{gc}">GPIO: {gs}</span>&nbsp;&nbsp;'
+    '<span style="color:{cc}">Cam: {cs}</span>&nbsp;&nbsp;'
+    '<span style="color:{ac}">AI: {am}</span>&nbsp;&nbsp;'
+    '<span style="color:#ffaa00">Pos: {alt:.1f}/{az:.1f}°</span>'
+)
+_STYLE_DOT_OK = "color: #00ff00; font-size: 16px; padding: 2px;"
+_STYLE_DOT_ERR = "color: #ff4444; font-size: 16px; padding: 2px;"
+
+# Tab bar and quick-action bar stylesheets (applied once at startup)
+_TAB_QSS = """
+QTabWidget::pane {
+    border: 1px solid #444444;
+    background-color: #2b2b2b;
+}
+QTabBar::tab {
+    background-color: #333333;
+    color: #cccccc;
+    padding: 4px 8px;
+    margin-right: 1px;
+    min-width: 50px;
+    min-height: 18px;
+    font-size: 8px;
+}
+QTabBar::tab:selected {
+    background-color: #2b2b2b;
+    color: #ffffff;
+    border-bottom: 2px solid #00a8ff;
+}
+QTabBar::tab:hover {
+    background-color: #3a3a3a;
+}
+"""
+
+_QUICK_BAR_QSS = """
+QFrame#quickBar {
+    background-color: #333333;
+    border-top: 1px solid #444444;
+    padding: 2px;
+}
+QFrame#quickBar QPushButton {
+    font-size: 8px;
+    padding: 2px 4px;
+    max-height: 28px;
+}
+"""
+
 class TelescopeMainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -30,12 +89,21 @@ class TelescopeMainWindow(QMainWindow):
         self.setWindowTitle("Robotic Telescope Control System - Raspberry Pi")
         self.setFixedSize(800, 480)  # Fixed size per requirement
         
+        # No layout/paint passes while the UI is being built (one pass at the end of init_ui)
+        self.setUpdatesEnabled(False)
+        
         # Apply stylesheet optimized for 800x480
         self.setStyleSheet(get_responsive_stylesheet())
         
         # Set application icon
         self.setWindowIcon(QIcon.fromTheme("camera"))
         
+        # Digest of the last settings.json written (auto-save skips identical writes)
+        self._last_settings_hash = None
+        
+        # Probe GPIO library once (not on every status tick)
+        self._gpio_available = importlib.util.find_spec("gpiozero") is not None
+        
         # Initialize UI
         self.init_ui()
         
@@ -63,29 +131,7 @@ class TelescopeMainWindow(QMainWindow):
         # Create tab widget (optimized for small screen)
         self.tab_widget = QTabWidget()
         self.tab_widget.setFont(QFont("Arial", 8))
-        self.tab_widget.setStyleSheet("""
-            QTabWidget::pane {
-                border: 1px solid #444444;
-                background-color: #2b2b2b;
-            }
-            QTabBar::tab {
-                background-color: #333333;
-                color: #cccccc;
-                padding: 4px 8px;
-                margin-right: 1px;
-                min-width: 50px;
-                min-height: 18px;
-                font-size: 8px;
-            }
-            QTabBar::tab:selected {
-                background-color: #2b2b2b;
-                color: #ffffff;
-                border-bottom: 2px solid #00a8ff;
-            }
-            QTabBar::tab:hover {
-                background-color: #3a3a3a;
-            }
-        """)
+        self.tab_widget.setStyleSheet(_TAB_QSS)
         
         self.main_layout.addWidget(self.tab_widget, stretch=1)
 
@@ -97,6 +143,10 @@ class TelescopeMainWindow(QMainWindow):
 
         # Create bottom control panel (compact)
         self.create_control_panel()
+        
+        # Construction done - single layout + paint pass
+        self.setUpdatesEnabled(True)
+        self.update()
 
     def create_menu_bar(self):
         """Create compact application menu bar"""
@@ -183,29 +233,75 @@ class TelescopeMainWindow(QMainWindow):
         
         # Status indicator
         self.status_indicator = QLabel("●")
-        self.status_indicator.setStyleSheet("color: #00ff00; font-size: 16px; padding: 2px;")
+        self.status_indicator.setStyleSheet(_STYLE_DOT_OK)
+        self._indicator_ok = True
         self.status_indicator.setToolTip("System Status: Online")
         toolbar.addWidget(self.status_indicator)
 
     def create_tabs(self):
-        """Create all application tabs (compact layout)"""
+        """Create tab placeholders; real widgets are built on first visit (compact layout)"""
         tab_order = SETTINGS["ui"]["tab_order"]
-        
+        builders = {
+            "control": (self.create_control_tab, "🏗️ Control"),
+            "sensors": (self.create_sensor_tab, "📡 Sensors"),
+            "camera": (self.create_camera_tab, "📷 Camera"),
+            "sun": (self.create_sun_tab, "☀️ Sun"),
+            "moon": (self.create_moon_tab, "🌙 Moon"),
+            "database": (self.create_database_tab, "💾 Database"),
+            "ai": (self.create_ai_tab, "🤖 AI"),
+        }
+        
+        # Not built yet (hasattr checks on None are simply False)
+        self.altitude_widget = None
+        self.azimuth_widget = None
+        self.sensor_widget = None
+        self.camera_widget = None
+        self.sun_widget = None
+        self.moon_widget = None
+        self.database_widget = None
+        self.ai_widget = None
+        
+        self._tab_factories = {}
+        self._tab_placeholders = {}
+        self.tab_widget.blockSignals(True)  # No currentChanged while tabs are being added
         for tab_name in tab_order:
-            if tab_name == "control":
-                self.create_control_tab()
-            elif tab_name == "sensors":
-                self.create_sensor_tab()
-            elif tab_name == "camera":
-                self.create_camera_tab()
-            elif tab_name == "sun":
-                self.create_sun_tab()
-            elif tab_name == "moon":
-                self.create_moon_tab()
-            elif tab_name == "database":
-                self.create_database_tab()
-            elif tab_name == "ai":
-                self.create_ai_tab()
+            if tab_name in builders:
+                self._tab_factories[tab_name] = builders[tab_name]
+                placeholder = QWidget()
+                self._tab_placeholders[tab_name] = placeholder
+                self.tab_widget.addTab(placeholder, builders[tab_name][1])
+        self.tab_widget.blockSignals(False)
+        
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+        self.on_tab_changed(self.tab_widget.currentIndex())
+
+    def on_tab_changed(self, index):
+        """Build the real widget the first time its tab is shown"""
+        page = self.tab_widget.widget(index)
+        for tab_name, placeholder in self._tab_placeholders.items():
+            if placeholder is page:
+                self._ensure_tab(tab_name)
+                break
+
+    def _ensure_tab(self, tab_name):
+        """Build a tab now if it is still a placeholder; returns the tab page"""
+        placeholder = self._tab_placeholders.pop(tab_name, None)
+        if placeholder is None:
+            return None
+        builder, label = self._tab_factories[tab_name]
+        real = builder()
+        
+        # Swap in place (signals blocked so the swap doesn't re-enter on_tab_changed)
+        index = self.tab_widget.indexOf(placeholder)
+        was_current = self.tab_widget.currentIndex() == index
+        self.tab_widget.blockSignals(True)
+        self.tab_widget.removeTab(index)
+        self.tab_widget.insertTab(index, real, label)
+        if was_current:
+            self.tab_widget.setCurrentIndex(index)
+        self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+        return real
 
     def create_control_tab(self):
         """Create control tab with altitude and azimuth (compact)"""
@@ -229,37 +325,37 @@ class TelescopeMainWindow(QMainWindow):
         self.azimuth_widget = AzimuthControlWidget()
         control_layout.addWidget(self.azimuth_widget, 50)
         
-        self.tab_widget.addTab(control_tab, "🏗️ Control")
+        return control_tab
 
     def create_sensor_tab(self):
         """Create sensor tab (compact)"""
         self.sensor_widget = SensorWidget()
-        self.tab_widget.addTab(self.sensor_widget, "📡 Sensors")
+        return self.sensor_widget
 
     def create_camera_tab(self):
         """Create camera tab (compact)"""
         self.camera_widget = WebcamWidget()
-        self.tab_widget.addTab(self.camera_widget, "📷 Camera")
+        return self.camera_widget
 
     def create_sun_tab(self):
         """Create sun tracking tab (compact)"""
         self.sun_widget = SunWidget()
-        self.tab_widget.addTab(self.sun_widget, "☀️ Sun")
+        return self.sun_widget
 
     def create_moon_tab(self):
         """Create moon tracking tab (compact)"""
         self.moon_widget = MoonWidget()
-        self.tab_widget.addTab(self.moon_widget, "🌙 Moon")
+        return self.moon_widget
 
     def create_database_tab(self):
         """Create database tab (compact)"""
         self.database_widget = DatabaseWidget()
-        self.tab_widget.addTab(self.database_widget, "💾 Database")
+        return self.database_widget
 
     def create_ai_tab(self):
         """Create AI assistant tab (compact)"""
         self.ai_widget = DeepSeekWidget()
-        self.tab_widget.addTab(self.ai_widget, "🤖 AI")
+        return self.ai_widget
 
     def create_status_bar(self):
         """Create compact status bar"""
@@ -267,22 +363,21 @@ class TelescopeMainWindow(QMainWindow):
         self.status_bar.setMaximumHeight(20)
         self.setStatusBar(self.status_bar)
         
-        # Add compact status widgets
-        self.gpio_status = QLabel("GPIO: ✓")
-        self.gpio_status.setStyleSheet("color: #00ff00; padding: 1px 5px; font-size: 8px;")
-        self.status_bar.addPermanentWidget(self.gpio_status)
-        
-        self.camera_status = QLabel("Camera: ✗")
-        self.camera_status.setStyleSheet("color: #ff4444; padding: 1px 5px; font-size: 8px;")
-        self.status_bar.addPermanentWidget(self.camera_status)
-        
-        self.ai_status = QLabel(f"AI: {SETTINGS['ai']['mode'].upper()}")
-        self.ai_status.setStyleSheet("color: #00a8ff; padding: 1px 5px; font-size: 8px;")
-        self.status_bar.addPermanentWidget(self.ai_status)
-        
-        self.position_status = QLabel("Pos: 0.0°/0.0°")
-        self.position_status.setStyleSheet("color: #ffaa00; padding: 1px 5px; font-size: 8px;")
-        self.status_bar.addPermanentWidget(self.position_status)
+        # One compact status label (GPIO / camera / AI / position as coloured spans)
+        self.status_label = QLabel()
+        self.status_label.setTextFormat(Qt.RichText)
+        self.status_label.setStyleSheet(_STYLE_STATUS)
+        self.status_bar.addPermanentWidget(self.status_label)
+        
+        # Current state (label text is only rebuilt when it changes)
+        self._status_state = {
+            "gc": _COLOR_OK, "gs": "✓",
+            "cc": _COLOR_ERR, "cs": "✗",
+            "ac": _COLOR_INFO, "am": SETTINGS["ai"]["mode"].upper(),
+            "alt": 0.0, "az": 0.0,
+        }
+        self._status_key = None
+        self._refresh_status_label()
         
         # Initial status message
         self.status_bar.showMessage("System ready", 5000)
@@ -290,101 +385,121 @@ class TelescopeMainWindow(QMainWindow):
     def create_control_panel(self):
         """Create compact bottom control panel"""
         control_panel = QFrame()
+        control_panel.setObjectName("quickBar")
         control_panel.setMaximumHeight(35)
-        control_panel.setStyleSheet("""
-            QFrame {
-                background-color: #333333;
-                border-top: 1px solid #444444;
-                padding: 2px;
-            }
-        """)
+        control_panel.setStyleSheet(_QUICK_BAR_QSS)  # One sheet styles every button
         
         panel_layout = QHBoxLayout(control_panel)
         panel_layout.setSpacing(2)
         
         # Compact quick actions
-        quick_actions = [
+        quick_actions = (
             ("🌙 Moon", self.point_to_moon),
             ("☀️ Sun", self.track_sun),
             ("🎯 Calibrate", self.calibrate_all),
             ("📸 Capture", self.capture_image),
             ("📊 Log", self.toggle_logging)
-        ]
+        )
         
         for text, callback in quick_actions:
             btn = QPushButton(text)
-            btn.setMaximumHeight(28)
-            btn.setStyleSheet("font-size: 8px; padding: 2px 4px;")
             btn.clicked.connect(callback)
             panel_layout.addWidget(btn)
         
         self.main_layout.addWidget(control_panel)
 
     def setup_timers(self):
-        """Setup update timers"""
-        # Position update timer
-        self.position_timer = QTimer()
-        self.position_timer.timeout.connect(self.update_position_status)
-        self.position_timer.start(1000)  # Update every second
-        
-        # System status timer
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_system_status)
-        self.status_timer.start(5000)  # Update every 5 seconds
-        
-        # Auto-save timer
-        self.autosave_timer = QTimer()
-        self.autosave_timer.timeout.connect(self.auto_save)
-        self.autosave_timer.start(30000)  # Auto-save every 30 seconds
+        """Setup update timer (one 1 Hz tick drives all periodic updates)"""
+        self._tick = 0
+        self.tick_timer = QTimer()
+        self.tick_timer.timeout.connect(self.on_tick)
+        self.tick_timer.start(1000)  # Tick every second
+
+    def on_tick(self):
+        """Dispatch periodic updates from the single tick timer"""
+        self._tick += 1
+        self.update_position_status()  # Every second
+        if self._tick % 5 == 0:
+            self.update_system_status()  # Every 5 seconds
+        if self._tick % 30 == 0:
+            self.auto_save()  # Auto-save every 30 seconds
 
     def update_position_status(self):
         """Update position status in status bar"""
         try:
             alt = self.altitude_widget.altitude_thread.current_altitude
             az = self.azimuth_widget.azimuth_thread.current_azimuth
-            self.position_status.setText(f"Pos: {alt:.1f}/{az:.1f}°")
+            self._status_state["alt"] = round(alt, 1)
+            self._status_state["az"] = round(az, 1)
+            self._refresh_status_label()
         except:
             pass
 
     def update_system_status(self):
         """Update system status indicators"""
+        state = self._status_state
+        
         # Update camera status
-        if hasattr(self.camera_widget, 'camera_thread') and self.camera_widget.camera_thread.running:
-            self.camera_status.setText("Cam: ✓")
-            self.camera_status.setStyleSheet("color: #00ff00; padding: 1px 5px; font-size: 8px;")
-        else:
-            self.camera_status.setText("Cam: ✗")
-            self.camera_status.setStyleSheet("color: #ff4444; padding: 1px 5px; font-size: 8px;")
+        cam_ok = hasattr(self.camera_widget, 'camera_thread') and self.camera_widget.camera_thread.running
+        state["cc"], state["cs"] = (_COLOR_OK, "✓") if cam_ok else (_COLOR_ERR, "✗")
         
         # Update AI status
-        mode = SETTINGS["ai"]["mode"]
-        if mode == "cloud":
-            self.ai_status.setText("AI: Cloud")
-            self.ai_status.setStyleSheet("color: #00a8ff; padding: 1px 5px; font-size: 8px;")
+        if SETTINGS["ai"]["mode"] == "cloud":
+            state["ac"], state["am"] = _COLOR_INFO, "Cloud"
         else:
-            self.ai_status.setText("AI: Local")
-            self.ai_status.setStyleSheet("color: #00ff00; padding: 1px 5px; font-size: 8px;")
+            state["ac"], state["am"] = _COLOR_OK, "Local"
         
-               # Update GPIO status
-        try:
-            import gpiozero
-            self.gpio_status.setText("GPIO: ✓")
-            self.gpio_status.setStyleSheet("color: #00ff00; padding: 1px 5px; font-size: 8px;")
-        except:
-            self.gpio_status.setText("GPIO: ✗")
-            self.gpio_status.setStyleSheet("color: #ff4444; padding: 1px 5px; font-size: 8px;")
+        # Update GPIO status
+        state["gc"], state["gs"] = (_COLOR_OK, "✓") if self._gpio_available else (_COLOR_ERR, "✗")
+        
+        self._refresh_status_label()
+
+    def _refresh_status_label(self):
+        """Re-render the status label only when the shown state changed"""
+        key = tuple(self._status_state.values())
+        if key != self._status_key:
+            self._status_key = key
+            self.status_label.setText(_STATUS_TMPL.format_map(self._status_state))
+
+    def _set_indicator(self, ok):
+        """Colour the toolbar status dot (skipped when unchanged)"""
+        if ok != self._indicator_ok:
+            self._indicator_ok = ok
+            self.status_indicator.setStyleSheet(_STYLE_DOT_OK if ok else _STYLE_DOT_ERR)
 
     def save_settings(self):
         """Save current settings to file"""
         try:
             settings_path = Path(__file__).parent / "settings.json"
-            with open(settings_path, "w") as f:
-                json.dump(SETTINGS, f, indent=2)
+            if orjson is not None:
+                data = orjson.dumps(SETTINGS, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+            else:
+                data = json.dumps(SETTINGS, indent=2, sort_keys=True).encode("utf-8")
+            
+            # Unchanged since the last write - nothing to do (the usual auto-save case)
+            digest = hashlib.blake2b(data).digest()
+            if digest != self._last_settings_hash:
+                self._write_atomic(settings_path, data)
+                self._last_settings_hash = digest
             self.status_bar.showMessage("Settings saved", 3000)
-            self.status_indicator.setStyleSheet("color: #00ff00; font-size: 16px; padding: 2px;")
+            self._set_indicator(True)
         except Exception as e:
             self.status_bar.showMessage(f"Save failed: {str(e)}", 5000)
-            self.status_indicator.setStyleSheet("color: #ff4444; font-size: 16px; padding: 2px;")
+            self._set_indicator(False)
+
+    @staticmethod
+    def _write_atomic(path, data):
+        """Write bytes to a temp file, fsync, then rename over path (no torn file on power loss)"""
+        tmp_path = f"{path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
 
     def load_settings(self):
         """Load settings from file"""
@@ -404,6 +519,7 @@ class TelescopeMainWindow(QMainWindow):
 
     def export_data(self):
         """Export data from database"""
+        self._ensure_tab("database")
         if hasattr(self.database_widget, 'logging_thread'):
             self.database_widget.logging_thread.export_log("csv")
             self.status_bar.showMessage("Data exported", 3000)
@@ -424,18 +540,32 @@ class TelescopeMainWindow(QMainWindow):
 
     def calibrate_all(self):
         """Calibrate all sensors and motors"""
+        # Lazy tabs: build the motor/sensor tabs so nothing is skipped silently
+        self._ensure_tab("control")
+        self._ensure_tab("sensors")
+        skipped = []
+        
         # Reset altitude/azimuth to zero
         if hasattr(self.altitude_widget, 'altitude_thread'):
             self.altitude_widget.altitude_thread.set_altitude(0)
+        else:
+            skipped.append("altitude")
         
         if hasattr(self.azimuth_widget, 'azimuth_thread'):
             self.azimuth_widget.azimuth_thread.set_azimuth(0)
+        else:
+            skipped.append("azimuth")
         
         # Calibrate compass sensor
         if hasattr(self.sensor_widget, 'sensor_thread'):
             self.sensor_widget.sensor_thread.calibrate()
+        else:
+            skipped.append("compass")
         
-        self.status_bar.showMessage("Calibration started", 3000)
+        if skipped:
+            self.status_bar.showMessage(f"Calibration started (skipped: {', '.join(skipped)})", 5000)
+        else:
+            self.status_bar.showMessage("Calibration started", 3000)
 
     def emergency_stop(self):
         """Emergency stop all operations"""
@@ -447,40 +577,57 @@ class TelescopeMainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
+            # Lazy tabs: make sure the motor controllers exist before stopping them
+            self._ensure_tab("control")
+            skipped = []
+            
             # Stop all motors
             if hasattr(self.altitude_widget, 'altitude_thread'):
                 self.altitude_widget.altitude_thread.stop_motors()
+            else:
+                skipped.append("altitude")
             
             if hasattr(self.azimuth_widget, 'azimuth_thread'):
                 self.azimuth_widget.azimuth_thread.stop_motors()
+            else:
+                skipped.append("azimuth")
             
-            # Stop camera recording
+            # Stop camera recording (a camera tab never opened cannot be recording)
             if hasattr(self.camera_widget, 'camera_thread'):
                 self.camera_widget.camera_thread.stop_recording()
             
             # Update status indicators
-            self.status_indicator.setStyleSheet("color: #ff4444; font-size: 16px; padding: 2px;")
-            self.status_bar.showMessage("EMERGENCY STOPPED", 5000)
+            self._set_indicator(False)
+            if skipped:
+                self.status_bar.showMessage(f"EMERGENCY STOPPED (not stopped: {', '.join(skipped)})", 10000)
+            else:
+                self.status_bar.showMessage("EMERGENCY STOPPED", 5000)
 
     def point_to_moon(self):
         """Point telescope to moon"""
+        if self.moon_widget is None and self._ensure_tab("moon") is None:
+            return
         self.tab_widget.setCurrentIndex(self.tab_widget.indexOf(self.moon_widget))
         if hasattr(self.moon_widget, 'point_to_moon'):
             self.moon_widget.point_to_moon()
 
     def track_sun(self):
         """Start tracking sun"""
+        if self.sun_widget is None and self._ensure_tab("sun") is None:
+            return
         self.tab_widget.setCurrentIndex(self.tab_widget.indexOf(self.sun_widget))
         if hasattr(self.sun_widget, 'sun_thread'):
             self.sun_widget.sun_thread.start_tracking()
 
     def capture_image(self):
         """Capture image from camera"""
+        self._ensure_tab("camera")
         if hasattr(self.camera_widget, 'capture_image'):
             self.camera_widget.capture_image()
 
     def toggle_logging(self):
         """Toggle data logging"""
+        self._ensure_tab("database")
         if hasattr(self.database_widget, 'logging_thread'):
             if self.database_widget.logging_thread.logging:
                 self.database_widget.logging_thread.stop_logging()
@@ -516,10 +663,8 @@ class TelescopeMainWindow(QMainWindow):
         """Cleanup all resources before exit"""
         self.status_bar.showMessage("Cleaning up...")
         
-        # Stop timers
-        self.position_timer.stop()
-        self.status_timer.stop()
-        self.autosave_timer.stop()
+        # Stop timer
+        self.tick_timer.stop()
         
         # Cleanup all widgets
         widgets = [